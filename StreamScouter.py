@@ -1,34 +1,52 @@
+import sys
+from startup_timer import StartupTimer
+
+# Started before the other imports so they show up in the breakdown.
+startup_timer = StartupTimer("--startup-timings" in sys.argv)
+
 import tkinter as tk
 import CheckForUpdate
 from tkinter import messagebox, filedialog
-from dotenv import load_dotenv
 from layout import Layout
-from twitch_api import TwitchAPI
+from twitch_api import TwitchAPI, HELIX_URL
 from notification_manager import NotificationManager
-from streamer_tracker import StreamerTracker
+from streamer_tracker import MultiCategoryTracker
 from settings_manager import SettingsManager
+from cache import PersistentCache
+from adaptive_interval import AdaptiveInterval
+from pinned_watcher import PinnedWatcher
 from tray_icon_manager import TrayIconManager
+from ui_queue import UIQueue
+from thumbnail_store import ThumbnailStore
+import atexit
+import requests
 import threading
 import time
 import os
-import winreg
-import sys
-from screeninfo import get_monitors
+
+startup_timer.mark("imports")
 
 os.chdir(os.path.dirname(os.path.abspath(sys.argv[0])))
 
 root = tk.Tk()
+ui_queue = UIQueue(root)
 
-CheckForUpdate.check_for_update_after_startup()
-
-load_dotenv()
-
-SETTINGS_FILE = "settings.txt"
+SETTINGS_FILE = "settings.json"
+LEGACY_SETTINGS_FILE = "settings.txt"
 ENV_FILE = ".env"
+PROFILE_CACHE_FILE = "profile_cache.json"
+GAME_CACHE_FILE = "game_cache.json"
+PINNED_FILE = "pinned.txt"
+THUMBNAIL_FILE = "thumbnails.bin"
+MAX_STREAMER_COUNT = 2000
+UPDATE_CHECK_DELAY_MS = 5000
 
-settings_manager = SettingsManager(SETTINGS_FILE, ENV_FILE)
+settings_manager = SettingsManager(SETTINGS_FILE, ENV_FILE, legacy_settings_file=LEGACY_SETTINGS_FILE)
+# Settings are written a moment after they change; make sure the last change lands on quit.
+atexit.register(settings_manager.flush)
 
 def validate_window_position(x, y, width, height):
+    from screeninfo import get_monitors
     monitors = get_monitors()
 
     for monitor in monitors:
@@ -49,27 +67,54 @@ default_game, default_count, default_width, default_height, default_notify, defa
 # This is for setting and validating window position
 default_x, default_y = validate_window_position(default_x, default_y, default_width, default_height)
 root.geometry(f"{default_width}x{default_height}+{default_x}+{default_y}")
+startup_timer.mark("settings and window")
 
 notify_var = tk.BooleanVar(value=default_notify)
 sound_file = tk.StringVar(value=default_sound)
 volume_var = tk.DoubleVar(value=default_volume)
-stream_links = {}
 
+# Tk variables may only be read on the Tk thread, so the tracker thread checks this copy.
+notify_enabled = default_notify
+
+def on_notify_changed(*args):
+    global notify_enabled
+    notify_enabled = notify_var.get()
+
+notify_var.trace_add("write", on_notify_changed)
+
+helix_url = settings_manager.load_env_variable("HELIX_URL") or HELIX_URL
+# Game ids and avatar URLs from one API must not leak into runs against another
+# (e.g. helix_stub), so the caches only persist against the real one.
+persist_caches = helix_url == HELIX_URL
+game_cache = PersistentCache(GAME_CACHE_FILE if persist_caches else None, ttl=7 * 24 * 60 * 60, max_size=500)
+profile_cache = PersistentCache(PROFILE_CACHE_FILE if persist_caches else None, ttl=24 * 60 * 60, max_size=5000)
 twitch_api = TwitchAPI(
     settings_manager.load_env_variable("YOUR_CLIENT_ID"),
-    settings_manager.load_env_variable("YOUR_ACCESS_TOKEN")
+    settings_manager.load_env_variable("YOUR_ACCESS_TOKEN"),
+    game_cache=game_cache,
+    profile_cache=profile_cache,
+    client_secret=settings_manager.load_env_variable("YOUR_CLIENT_SECRET"),
+    on_token_refresh=lambda access_token: on_token_refresh(access_token),
+    base_url=helix_url
 )
 notification_manager = NotificationManager(sound_file, volume_var)
-tracker = StreamerTracker(twitch_api, notify_var, notification_manager)
+tracker = MultiCategoryTracker(twitch_api, notify_var, notification_manager)
+pinned_watcher = PinnedWatcher(twitch_api, PINNED_FILE)
+thumbnail_store = ThumbnailStore(THUMBNAIL_FILE)
+poll_interval = AdaptiveInterval(
+    settings_manager.get("min_poll_interval"),
+    settings_manager.get("max_poll_interval"),
+    default_interval=settings_manager.get("poll_interval"),
+    enabled=settings_manager.get("adaptive_polling")
+)
+startup_timer.mark("api and tracker")
 
 stop_tracking = threading.Event()
-seen_streamers = set()
-linger_streamers = {}
 first_run = True
 minimized_at = 0
 tracking_thread = None
 is_updating = False
-cached_game_id = None
+cached_game_ids = None
 
 def save_settings(game_name, streamer_count, width, height):
     x = root.winfo_x()
@@ -77,6 +122,8 @@ def save_settings(game_name, streamer_count, width, height):
     settings_manager.save_settings(
         game_name, streamer_count, width, height, notify_var, sound_file, volume_var, layout.launch_at_startup_var.get(), x, y
     )
+    # Every way of quitting saves settings, so the avatar index is flushed here too.
+    thumbnail_store.save()
 
 def generate_access_token():
     client_id = layout.client_id_entry.get()
@@ -85,8 +132,11 @@ def generate_access_token():
     settings_manager.save_env_variable("CLIENT_ID", client_id)
     settings_manager.save_env_variable("CLIENT_SECRET", client_secret)
 
+    twitch_api.client_id = client_id
+    twitch_api.client_secret = client_secret
     access_token = twitch_api.generate_access_token(client_secret)
     if access_token:
+        twitch_api.access_token = access_token
         settings_manager.save_env_variable("ACCESS_TOKEN", access_token)
         layout.access_token_entry.delete(0, tk.END)
         layout.access_token_entry.insert(0, access_token)
@@ -99,8 +149,19 @@ def save_client_info():
     client_secret = layout.client_secret_entry.get()
     settings_manager.save_env_variable("CLIENT_ID", client_id)
     settings_manager.save_env_variable("CLIENT_SECRET", client_secret)
+    twitch_api.client_secret = client_secret
     messagebox.showinfo("Success", "Client ID and Secret saved!")
 
+def on_token_refresh(access_token):
+    """Persist a token that TwitchAPI renewed on its own after a 401."""
+    settings_manager.save_env_variable("ACCESS_TOKEN", access_token)
+
+    def update_entry():
+        layout.access_token_entry.delete(0, tk.END)
+        layout.access_token_entry.insert(0, access_token)
+
+    ui_queue.push(update_entry, key="access_token_entry")
+
 tray_icon_manager = TrayIconManager(
     root=root,
     on_quit=lambda: tray_icon_manager.quit_app(save_settings, layout)
@@ -119,75 +180,107 @@ def update_volume(value):
     print(f"Volume updated to: {value}")
 
 def track_changes(game_name, streamer_count):
-    global seen_streamers, minimized_at, first_run
+    global minimized_at, first_run
     stop_tracking.clear()
+    poll_interval.reset()
 
     while not stop_tracking.is_set():
-        global cached_game_id
-        if not cached_game_id:
-            cached_game_id = twitch_api.get_game_id(game_name)
-            if not cached_game_id:
-                show_error(f"Game '{game_name}' not found on Twitch.")
-                return
-        
-        top_streams = tracker.get_top_streams(cached_game_id, streamer_count)
-        layout.total_streamers_count = len(top_streams)
-        streamer_data = tracker.process_streamers(top_streams)
-
-        process_streamers_and_update_ui(streamer_data)
+        global cached_game_ids
+        try:
+            if not cached_game_ids:
+                cached_game_ids = resolve_game_ids(game_name)
+                if not cached_game_ids:
+                    return
+                tracker.set_categories(cached_game_ids)
+
+            top_streams_by_game = tracker.get_top_streams(streamer_count)
+        except (requests.RequestException, ValueError) as e:
+            # A failed poll leaves the list as it was; try again after the usual wait.
+            print(f"Error refreshing streams: {e}")
+            countdown_timer(poll_interval.interval)
+            continue
+
+        top_streams = [stream for streams in top_streams_by_game.values() for stream in streams]
+        delta = tracker.process_streamers(top_streams_by_game)
+        if first_run:
+            startup_timer.mark("first list fetched")
+
+        process_streamers_and_update_ui(delta, len(top_streams))
+        try:
+            update_pinned_ui(pinned_watcher.poll())
+        except (requests.RequestException, ValueError) as e:
+            print(f"Error checking pinned streamers: {e}")
         first_run = False
-        countdown_timer()
+        countdown_timer(poll_interval.update(stream["id"] for stream in top_streams))
+
+def resolve_game_ids(game_name):
+    """Resolve every comma-separated game name to its Twitch id, reporting the ones that don't exist."""
+    game_ids = []
+    for name in game_name.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        game_id = twitch_api.get_game_id(name)
+        if not game_id:
+            show_error(f"Game '{name}' not found on Twitch.")
+        elif game_id not in game_ids:
+            game_ids.append(game_id)
+    return game_ids
 
 def show_error(message):
-    root.after(0, lambda: messagebox.showerror("Error", message))
-
-def process_streamers_and_update_ui(streamer_data):
-    global seen_streamers, minimized_at, first_run
-
-    current_ids = {stream["id"] for stream in streamer_data}
-    new_streamer_ids = current_ids - {s["id"] for s in seen_streamers}
-
-    if root.state() != 'withdrawn':
-        for stream in streamer_data:
-            root.after(0, lambda s=stream: layout.add_item_to_main_canvas(
-                s["name"], s["link"], s["profile_picture"], linger_duration=None, remaining_linger=None
-            ))
-            stream_links[stream["id"]] = stream["link"]
-        
-        for lingering in tracker.linger_streamers:
-            root.after(0, lambda s=lingering: layout.add_item_to_main_canvas(
-                s["name"], s["link"], s["profile_picture"], StreamerTracker.linger_duration, remaining_linger=s["countdown"]
-            ))
-
-        shown_count = len(streamer_data) + len(tracker.linger_streamers)
-        total_count = layout.total_streamers_count
-        root.after(0, lambda: layout.streamer_count_label.config(
-            text=f"{shown_count}/{total_count} streamers shown"
-        ))
-    
-    if new_streamer_ids and not first_run:
+    ui_queue.push(lambda: messagebox.showerror("Error", message))
+
+def process_streamers_and_update_ui(delta, total_count):
+    global minimized_at, first_run
+
+    # Only the rows in the delta are touched, so applying it even while
+    # minimized is cheap and keeps the list in sync for when it is shown.
+    # Deltas build on each other, so they are queued unkeyed and never coalesced.
+    ui_queue.push(lambda: layout.apply_delta(delta))
+    if first_run:
+        ui_queue.push(on_first_list_shown)
+
+    shown_count = len(delta.current) + len(delta.lingering)
+    ui_queue.push(lambda: layout.streamer_count_label.config(
+        text=f"{shown_count}/{total_count} streamers shown"
+    ), key="streamer_count_label")
+
+    if delta.added and not first_run:
         if minimized_at == 0 or time.time() - minimized_at >= 10:
-            if notify_var.get():
+            if notify_enabled:
                 notification_manager.play_notification()
-            if root.state() == 'withdrawn':
+            # Tk may only be queried from its own thread; the tray manager tracks this instead.
+            if tray_icon_manager.withdrawn:
                 tray_icon_manager.start_blinking_icon()
 
-    seen_streamers = streamer_data + tracker.linger_streamers
-
-def countdown_timer():
-    for i in range(10, 0, -1):
+def on_first_list_shown():
+    startup_timer.mark("first list shown")
+    startup_timer.report()
+
+def update_pinned_ui(transitions):
+    for status, stream in transitions:
+        # Keyed per streamer, so going online and offline within one frame only applies the latest.
+        if status == "online":
+            ui_queue.push(lambda s=stream: layout.add_item_to_pinned_canvas(
+                s["id"], s["name"], s["link"], s.get("profile_picture")
+            ), key=("pinned", stream["id"]))
+        else:
+            ui_queue.push(lambda s=stream: layout.remove_item_from_pinned_canvas(s["id"]), key=("pinned", stream["id"]))
+
+def countdown_timer(interval):
+    for i in range(interval, 0, -1):
         if stop_tracking.is_set():
             return
 
         if i <= 1:
-            root.after(0, lambda: layout.track_button.config(state=tk.DISABLED))
+            ui_queue.push(lambda: layout.track_button.config(state=tk.DISABLED), key="track_button")
         if i > 1:
-            root.after(0, lambda: layout.track_button.config(state=tk.NORMAL))
+            ui_queue.push(lambda: layout.track_button.config(state=tk.NORMAL), key="track_button")
 
-        root.after(0, lambda t=i: layout.timer_label.config(text=f"Next refresh in: {t}s"))
+        ui_queue.push(lambda t=i: layout.timer_label.config(text=f"Next refresh in: {t}s (every {interval}s)"), key="timer_label")
         time.sleep(1)
 
-    root.after(0, lambda: layout.timer_label.config(text="Refreshing streams..."))
+    ui_queue.push(lambda: layout.timer_label.config(text="Refreshing streams..."), key="timer_label")
 
 def update_streamers():
     global tracking_thread, stop_tracking, is_updating
@@ -205,16 +298,16 @@ def update_streamers():
             tracking_thread.join()
 
         stop_tracking.clear()
-        global cached_game_id
-        cached_game_id = None
+        global cached_game_ids
+        cached_game_ids = None
 
-        root.after(0, lambda: layout.timer_label.config(text="Next refresh in: 10s"))
+        root.after(0, lambda: layout.timer_label.config(text=f"Next refresh in: {poll_interval.default_interval}s"))
 
         game_name = layout.game_entry.get()
         streamer_count = int(layout.count_entry.get())
 
-        if streamer_count > 100:
-            streamer_count = 100
+        if streamer_count > MAX_STREAMER_COUNT:
+            streamer_count = MAX_STREAMER_COUNT
             layout.count_entry.delete(0, tk.END)
             layout.count_entry.insert(0, str(streamer_count))
 
@@ -239,6 +332,8 @@ def set_is_updating(value):
 
 def toggle_launch_at_startup():
     """Enable or disable launching the app at startup."""
+    import winreg
+
     app_name = "StreamScouter"
     app_path = os.path.abspath(sys.argv[0])
     startup_key = r"Software\Microsoft\Windows\CurrentVersion\Run"
@@ -279,8 +374,22 @@ def on_close():
     )
     tray_icon_manager.quit_app(save_settings, layout)
 
+def on_idle_after_startup():
+    """Work that isn't needed for the first list: warm up audio, then check for updates a bit later."""
+    startup_timer.mark("main loop idle")
+    if not default_game:
+        # Nothing to poll, so startup ends here.
+        startup_timer.report()
+    notification_manager.preload()
+    root.after(UPDATE_CHECK_DELAY_MS, CheckForUpdate.check_for_update_after_startup)
+
 root.protocol("WM_DELETE_WINDOW", on_close)
 
+# The first poll runs while the window is being built; its UI updates wait in
+# ui_queue until the main loop starts draining it.
+start_tracking_on_launch()
+startup_timer.mark("first poll started")
+
 layout = Layout(
     root,
     config={
@@ -304,10 +413,15 @@ layout = Layout(
         "update_volume": update_volume,
         "toggle_launch_at_startup": toggle_launch_at_startup,
     },
-    twitch_api=twitch_api
+    twitch_api=twitch_api,
+    ui_queue=ui_queue,
+    thumbnail_store=thumbnail_store
 )
 
-root.after(0, start_tracking_on_launch)
+startup_timer.mark("layout built")
+
+ui_queue.start()
+root.after_idle(on_idle_after_startup)
 
 root.bind("<Unmap>", lambda event: tray_icon_manager.on_minimize() if root.state() == "iconic" else None)
 root.mainloop()
@@ -0,0 +1,40 @@
+class AdaptiveInterval:
+    """Picks the next poll interval from how much the tracked top-N set changes between ticks."""
+
+    def __init__(self, min_interval=5, max_interval=60, default_interval=10, enabled=True, backoff=1.5, busy_churn=0.1, smoothing=0.5):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.enabled = enabled
+        self.backoff = backoff
+        self.busy_churn = busy_churn
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self.interval = self.default_interval
+        self.churn = 0.0
+        self.previous_ids = None
+
+    def update(self, current_ids):
+        """Record this tick's streamer ids and return the interval (whole seconds) to wait before the next one."""
+        current_ids = set(current_ids)
+        previous_ids, self.previous_ids = self.previous_ids, current_ids
+        if previous_ids is None or not self.enabled:
+            return self.interval
+
+        changed = len(current_ids ^ previous_ids)
+        ratio = changed / max(len(current_ids | previous_ids), 1)
+        self.churn = self.smoothing * ratio + (1 - self.smoothing) * self.churn
+
+        if changed == 0:
+            # Quiet category: back off multiplicatively.
+            interval = self.interval * self.backoff
+        else:
+            # Busy category: head for min_interval as churn approaches busy_churn.
+            pressure = min(self.churn / self.busy_churn, 1.0)
+            target = self.max_interval - (self.max_interval - self.min_interval) * pressure
+            interval = target if target < self.interval else (self.interval + target) / 2
+
+        self.interval = int(round(max(self.min_interval, min(self.max_interval, interval))))
+        return self.interval
@@ -0,0 +1,187 @@
+import asyncio
+import aiohttp
+from rate_limiter import RateLimiter
+from twitch_api import StreamPager, HELIX_URL, AUTH_URL
+
+class AsyncTwitchAPI:
+    """Coroutine counterpart of TwitchAPI for driving many categories and lookups from one event loop.
+
+    Needs aiohttp. Stream paging and rate-limit handling are shared with
+    TwitchAPI; it has no game or profile caches and no
+    get_top_streams_by_game or get_live_streams yet.
+    """
+
+    def __init__(self, client_id, access_token, pool_size=10, max_concurrency=8, rate_limiter=None, max_retries=5, timeout=10, client_secret=None, on_token_refresh=None, base_url=HELIX_URL, auth_url=None):
+        self.client_id = client_id
+        self.base_url = base_url.rstrip("/")
+        self.auth_url = auth_url or (AUTH_URL if base_url == HELIX_URL else f"{self.base_url}/oauth2/token")
+        self.client_secret = client_secret
+        self.on_token_refresh = on_token_refresh
+        self.token_lock = None
+        self.pool_size = pool_size
+        self.max_concurrency = max_concurrency
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.session = None
+        self.semaphore = None
+        self.tasks = set()
+        self.headers = {}
+        self.access_token = access_token
+
+    @property
+    def access_token(self):
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value):
+        self._access_token = value
+        self.headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {value}"}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def get_session(self):
+        """Create the pooled session lazily so it is bound to the running event loop."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self.session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.token_lock = asyncio.Lock()
+        return self.session
+
+    def spawn(self, coro):
+        """Start a tracked task so close() can cancel it."""
+        task = asyncio.ensure_future(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def cancel_all(self):
+        """Cancel every request started through this client that is still in flight."""
+        for task in list(self.tasks):
+            task.cancel()
+
+    async def close(self):
+        self.cancel_all()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def helix_get(self, url, params=None):
+        """GET a Helix endpoint and return (status, json); shares the rate budget and concurrency limit.
+
+        A 401 renews the app token once and replays the request.
+        """
+        session = self.get_session()
+        refreshed = False
+        async with self.semaphore:
+            for attempt in range(self.max_retries + 1):
+                await asyncio.sleep(self.rate_limiter.reserve())
+                token = self.access_token
+                async with session.get(url, headers=self.headers, params=params) as response:
+                    if response.status == 401 and not refreshed:
+                        refreshed = True
+                        if await self.refresh_access_token(token):
+                            continue
+                        return response.status, {}
+                    if not self.rate_limiter.after_response(response.status, response.headers, attempt < self.max_retries):
+                        data = await response.json() if response.status == 200 else {}
+                        return response.status, data
+            return 429, {}
+
+    async def refresh_access_token(self, stale_token):
+        """Renew the app token after a 401; concurrent callers wait on a single refresh."""
+        async with self.token_lock:
+            if self.access_token != stale_token:
+                return True
+            if not self.client_secret:
+                return False
+
+            access_token = await self.generate_access_token(self.client_secret)
+            if not access_token:
+                return False
+            self.access_token = access_token
+
+        if self.on_token_refresh:
+            self.on_token_refresh(access_token)
+        return True
+
+    async def get_game_id(self, game_name):
+        url = f"{self.base_url}/games"
+        status, data = await self.helix_get(url, params={"name": game_name})
+        return data["data"][0]["id"] if data.get("data") else None
+
+    async def get_top_streams(self, game_id, limit):
+        return [stream async for page in self.iter_top_streams(game_id, limit) for stream in page]
+
+    async def iter_top_streams(self, game_id, limit, page_size=100):
+        """Yield pages of the top streams for a game, following the Helix cursor until limit is reached."""
+        url = f"{self.base_url}/streams"
+        pager = StreamPager(game_id, limit, page_size)
+        while not pager.done:
+            status, data = await self.helix_get(url, params=pager.params())
+            page = pager.feed(data)
+            if page:
+                yield page
+
+    async def generate_access_token(self, client_secret):
+        """Generate an access token using the client ID and client secret."""
+        url = self.auth_url
+        payload = {
+            "client_id": self.client_id,
+            "client_secret": client_secret,
+            "grant_type": "client_credentials"
+        }
+        async with self.get_session().post(url, data=payload) as response:
+            if response.status == 200:
+                return (await response.json()).get("access_token")
+            print(f"Failed to generate access token: {response.status} - {await response.text()}")
+            return None
+
+    async def get_profile_pictures(self, user_ids, batch_size=100):
+        """Fetch profile pictures for all user IDs, running the 100-id batches concurrently."""
+        user_ids = list(user_ids)
+        batches = [user_ids[i:i + batch_size] for i in range(0, len(user_ids), batch_size)]
+        results = await asyncio.gather(*(self.spawn(self.fetch_profile_batch(batch)) for batch in batches))
+
+        profile_pictures = {}
+        for fetched_users in results:
+            profile_pictures.update(fetched_users)
+        return profile_pictures
+
+    async def fetch_profile_batch(self, batch):
+        url = f"{self.base_url}/users"
+        params = [("id", user_id) for user_id in batch]
+
+        try:
+            status, data = await self.helix_get(url, params=params)
+        except aiohttp.ClientError as e:
+            print(f"Request failed: {e}")
+            return {}
+        if status != 200:
+            print(f"Error fetching profile pictures: {status}")
+            return {}
+        return {user["id"]: user["profile_image_url"] for user in data.get("data", [])}
+
+    async def search_categories(self, query):
+        """Search for categories on Twitch based on the query; None when the request failed."""
+        url = f"{self.base_url}/search/categories"
+        status, data = await self.helix_get(url, params={"query": query, "first": 10})
+        if status == 200:
+            return [{"id": item["id"], "name": item["name"]} for item in data.get("data", [])]
+        return None
+
+    async def fetch_image(self, image_url):
+        """Download an image through the shared connection pool and return its bytes."""
+        session = self.get_session()
+        async with self.semaphore:
+            async with session.get(image_url) as response:
+                response.raise_for_status()
+                return await response.read()
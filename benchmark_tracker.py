@@ -0,0 +1,172 @@
+"""Benchmarks StreamerTracker.process_streamers on synthetic top-N lists under churn.
+
+    python benchmark_tracker.py
+    python benchmark_tracker.py --sizes 100,1000 --churn 0.01,0.1 --save-baseline tracker_baseline.json
+    python benchmark_tracker.py --baseline tracker_baseline.json --tolerance 0.25
+
+Each case reports the median wall time per tick and the memory allocated per
+tick (tracemalloc). With --baseline the run exits with status 1 when a case is
+slower or allocates more than the stored baseline allows.
+"""
+import argparse
+import itertools
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from streamer_tracker import StreamerTracker
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+DEFAULT_CHURN = [0.01, 0.05, 0.2, 0.5]
+# Simulated seconds between ticks; linger countdowns run on this clock.
+POLL_INTERVAL = 10
+
+
+class ChurnGenerator:
+    """Produces successive top-N lists where a share of the entries is replaced or reordered each tick."""
+
+    def __init__(self, size, churn, seed=0):
+        self.random = random.Random(seed)
+        self.size = size
+        self.churn = churn
+        self.next_id = 0
+        self.streams = [self.new_stream() for _ in range(size)]
+
+    def new_stream(self):
+        self.next_id += 1
+        streamer_id = str(self.next_id)
+        return {
+            "id": streamer_id,
+            "name": f"streamer{streamer_id}",
+            "link": f"https://twitch.tv/streamer{streamer_id}",
+            "profile_picture": f"https://example.invalid/{streamer_id}.png",
+        }
+
+    def tick(self):
+        changes = max(1, int(self.size * self.churn))
+        for index in self.random.sample(range(self.size), changes):
+            self.streams[index] = self.new_stream()
+        # Rank shuffles among the survivors.
+        for _ in range(changes):
+            a, b = self.random.randrange(self.size), self.random.randrange(self.size)
+            self.streams[a], self.streams[b] = self.streams[b], self.streams[a]
+        return list(self.streams)
+
+
+def run_case(size, churn, ticks, warmup, time_limit):
+    """Return the per-tick metrics for one case, or None if a warm-up tick exceeded time_limit."""
+    generator = ChurnGenerator(size, churn)
+    tracker = StreamerTracker(None, None, None)
+    clock = (tick * POLL_INTERVAL for tick in itertools.count(1))
+    # Warm up past one linger period so the linger list is at steady state.
+    for _ in range(warmup):
+        top_streams = generator.tick()
+        started = time.perf_counter()
+        tracker.process_streamers(top_streams, next(clock))
+        if time.perf_counter() - started > time_limit:
+            return None
+
+    tick_lists = [generator.tick() for _ in range(ticks * 2)]
+
+    timings = []
+    for top_streams in tick_lists[:ticks]:
+        now = next(clock)
+        started = time.perf_counter()
+        tracker.process_streamers(top_streams, now)
+        timings.append(time.perf_counter() - started)
+
+    allocations = []
+    tracemalloc.start()
+    for top_streams in tick_lists[ticks:]:
+        now = next(clock)
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        tracker.process_streamers(top_streams, now)
+        _, peak = tracemalloc.get_traced_memory()
+        allocations.append(peak - before)
+    tracemalloc.stop()
+
+    return {
+        "tick_ms": statistics.median(timings) * 1000,
+        "alloc_kb": statistics.median(allocations) / 1024,
+    }
+
+
+def check_baseline(results, baseline, tolerance, noise_ms):
+    regressions = []
+    for case, result in results.items():
+        expected = baseline.get(case)
+        if not expected:
+            continue
+        if result is None:
+            regressions.append(f"{case}: exceeded the time limit")
+            continue
+        for metric in ("tick_ms", "alloc_kb"):
+            allowed = expected[metric] * (1 + tolerance)
+            if metric == "tick_ms":
+                # Sub-millisecond cases are mostly timer noise.
+                allowed = max(allowed, expected[metric] + noise_ms)
+            if result[metric] > allowed:
+                regressions.append(f"{case} {metric}: {result[metric]:.2f} > {allowed:.2f} (baseline {expected[metric]:.2f})")
+    return regressions
+
+
+def parse_list(text, kind):
+    return [kind(value) for value in text.split(",") if value.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark StreamerTracker churn processing.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="comma-separated list sizes")
+    parser.add_argument("--churn", default=",".join(map(str, DEFAULT_CHURN)), help="comma-separated churn rates")
+    parser.add_argument("--ticks", type=int, default=5, help="measured ticks per case")
+    parser.add_argument("--warmup", type=int, default=StreamerTracker.linger_duration // POLL_INTERVAL + 2)
+    parser.add_argument("--time-limit", type=float, default=2.0,
+                        help="give up on a case (and bigger sizes at that churn) once a tick takes longer than this (seconds)")
+    parser.add_argument("--save-baseline", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--noise-ms", type=float, default=0.5, help="tick time differences below this never count as regressions")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'size':>8} {'churn':>6} {'ms/tick':>10} {'KiB/tick':>10}")
+    for churn in parse_list(args.churn, float):
+        too_slow = False
+        for size in sorted(parse_list(args.sizes, int)):
+            case = f"{size}:{churn}"
+            if too_slow:
+                results[case] = None
+                print(f"{size:>8} {churn:>6} {'skipped':>10}")
+                continue
+            result = run_case(size, churn, args.ticks, args.warmup, args.time_limit)
+            results[case] = result
+            if result is None:
+                too_slow = True
+                print(f"{size:>8} {churn:>6} {'too slow':>10}")
+                continue
+            print(f"{size:>8} {churn:>6} {result['tick_ms']:>10.2f} {result['alloc_kb']:>10.1f}")
+            too_slow = result["tick_ms"] / 1000 > args.time_limit
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({case: result for case, result in results.items() if result}, f, indent=2)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = check_baseline(results, baseline, args.tolerance, args.noise_ms)
+        if regressions:
+            print("Regressions against baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
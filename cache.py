@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+class PersistentCache:
+    """Size-bounded LRU cache with per-entry TTL that can persist itself to a JSON file."""
+
+    MISSING = object()
+
+    def __init__(self, path=None, ttl=None, max_size=1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Serialises whole saves, so concurrent ones can't share the temp file
+        # or publish an older snapshot over a newer one.
+        self.save_lock = threading.Lock()
+        self.dirty = False
+        self.load()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self.entries[key]
+                self.dirty = True
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def __contains__(self, key):
+        return self.get(key, self.MISSING) is not self.MISSING
+
+    def __len__(self):
+        return len(self.entries)
+
+    def set(self, key, value, ttl=None):
+        """Store a value; ttl overrides the cache default for this entry."""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            self.dirty = True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.dirty = True
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                rows = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading cache '{self.path}': {e}")
+            return
+        if not self.valid_rows(rows):
+            print(f"Ignoring malformed cache '{self.path}'")
+            return
+
+        now = time.time()
+        with self.lock:
+            for key, value, expires_at in rows[-self.max_size:]:
+                if expires_at is None or expires_at > now:
+                    self.entries[key] = (value, expires_at)
+
+    @staticmethod
+    def valid_rows(rows):
+        """Check that rows is a list of [key, value, expires_at] as save() writes them."""
+        if not isinstance(rows, list):
+            return False
+        for row in rows:
+            if not isinstance(row, list) or len(row) != 3 or not isinstance(row[0], str):
+                return False
+            expires_at = row[2]
+            if expires_at is not None and (isinstance(expires_at, bool) or not isinstance(expires_at, (int, float))):
+                return False
+        return True
+
+    def save(self):
+        """Write the cache to disk if anything changed since the last save."""
+        if not self.path or not self.dirty:
+            return
+        with self.save_lock:
+            with self.lock:
+                if not self.dirty:
+                    return
+                rows = [[key, value, expires_at] for key, (value, expires_at) in self.entries.items()]
+                self.dirty = False
+
+            temp_path = f"{self.path}.tmp"
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump(rows, f)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Error saving cache '{self.path}': {e}")
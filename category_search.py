@@ -0,0 +1,99 @@
+import threading
+import requests
+from cache import PersistentCache
+
+class CategorySearch:
+    """Debounced category typeahead with an LRU of results, prefix narrowing and stale-response dropping."""
+
+    def __init__(self, twitch_api, on_results, dispatch, delay=0.3, cache_size=200, cache_ttl=10 * 60):
+        self.twitch_api = twitch_api
+        self.on_results = on_results
+        self.dispatch = dispatch
+        self.delay = delay
+        self.cache = PersistentCache(ttl=cache_ttl, max_size=cache_size)
+        self.condition = threading.Condition()
+        self.generation = 0
+        self.pending = None
+        self.worker = None
+
+    def search(self, query):
+        """Show results for query, from the cache when possible, otherwise after the debounce delay."""
+        key = query.strip().lower()
+        with self.condition:
+            self.generation += 1
+            generation = self.generation
+            self.pending = None
+
+        if not key:
+            self.deliver(generation, [])
+            return
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.deliver(generation, cached)
+            return
+
+        # Helix search is fuzzy, so narrowed prefix results are only shown
+        # until the real answer for key arrives.
+        narrowed = self.narrow_from_prefix(key)
+        if narrowed:
+            self.deliver(generation, narrowed)
+
+        with self.condition:
+            self.pending = (generation, query.strip(), key)
+            self.condition.notify()
+            if not self.worker or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self.run, daemon=True)
+                self.worker.start()
+
+    def cancel(self):
+        """Drop any pending or in-flight search."""
+        with self.condition:
+            self.generation += 1
+            self.pending = None
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def narrow_from_prefix(self, key):
+        """Filter the results of the longest cached prefix of key, or None if no prefix is cached."""
+        for end in range(len(key) - 1, 0, -1):
+            results = self.cache.get(key[:end])
+            if results is not None:
+                return [category for category in results if key in category["name"].lower()]
+        return None
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.condition.wait()
+                # Debounce: restart the wait whenever a newer keystroke replaces the query.
+                while True:
+                    pending = self.pending
+                    self.condition.wait(self.delay)
+                    if self.pending is pending:
+                        break
+                if not pending:
+                    continue
+                self.pending = None
+
+            generation, query, key = pending
+            try:
+                categories = self.twitch_api.search_categories(query)
+            except requests.RequestException as e:
+                print(f"Category search failed: {e}")
+                continue
+            if categories is None:
+                # A failed lookup is not an answer; the next keystroke asks again.
+                continue
+            self.cache.set(key, categories)
+            self.deliver(generation, categories)
+
+    def deliver(self, generation, categories):
+        """Hand results to the UI thread, dropping them if a newer query superseded this one."""
+        def apply():
+            if self.is_current(generation):
+                self.on_results(categories)
+
+        self.dispatch(apply)
@@ -0,0 +1,113 @@
+"""Fires bursts of alerts through NotificationManager on SDL's dummy audio driver, so no sound device is needed.
+
+    python check_notifications.py
+    python check_notifications.py --sound dist/default.wav --bursts 5 --burst-size 50
+
+Every burst should play exactly one sound, since alerts within the coalesce
+window of the last one are dropped. A missing sound file must not stick: once
+it exists, the next alert plays it. Exits with status 1 when a check fails.
+"""
+import os
+
+# Must be set before pygame initialises its mixer.
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+
+from notification_manager import NotificationManager
+
+
+class Value:
+    """Stand-in for a Tk variable, which would need a display."""
+
+    def __init__(self, value):
+        self.value = value
+        self.callbacks = []
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+        for callback in self.callbacks:
+            callback()
+
+    def trace_add(self, mode, callback):
+        self.callbacks.append(callback)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def check_bursts(sound, bursts, burst_size, coalesce_window):
+    manager = NotificationManager(Value(sound), Value(0.5), coalesce_window=coalesce_window)
+    manager.preload()
+    if not wait_for(lambda: manager.mixer_ready is not None) or not manager.mixer_ready:
+        return ["mixer did not start"]
+
+    failures = []
+    for burst in range(bursts):
+        played = manager.played
+        for _ in range(burst_size):
+            manager.play_notification()
+        wait_for(lambda: manager.played > played)
+        # Anything still queued from this burst lands inside the coalesce window.
+        time.sleep(coalesce_window * 1.5)
+        if manager.played - played != 1:
+            failures.append(f"burst {burst + 1}: {burst_size} alerts played {manager.played - played} sounds, expected 1")
+    return failures
+
+
+def check_missing_file(sound, coalesce_window):
+    directory = tempfile.mkdtemp()
+    try:
+        late_file = os.path.join(directory, "late.wav")
+        manager = NotificationManager(Value(late_file), Value(0.5), coalesce_window=coalesce_window,
+                                      default_file=os.path.join(directory, "missing.wav"))
+        manager.play_notification()
+        time.sleep(coalesce_window)
+        if manager.played:
+            return ["played a sound although no file exists"]
+
+        shutil.copy(sound, late_file)
+        manager.play_notification()
+        if not wait_for(lambda: manager.played == 1):
+            return ["a sound file that was missing at first never played once it existed"]
+        return []
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check NotificationManager with SDL's dummy audio driver.")
+    parser.add_argument("--sound", default=os.path.join("dist", "default.wav"), help="sound file to play")
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--burst-size", type=int, default=20, help="alerts fired at once per burst")
+    parser.add_argument("--coalesce-window", type=float, default=0.3, help="seconds")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.sound):
+        print(f"Sound file '{args.sound}' not found.")
+        sys.exit(1)
+
+    failures = check_bursts(args.sound, args.bursts, args.burst_size, args.coalesce_window)
+    failures += check_missing_file(args.sound, args.coalesce_window)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"ok: {args.bursts} bursts of {args.burst_size} alerts each played one sound; a late sound file was picked up")
+
+
+if __name__ == "__main__":
+    main()
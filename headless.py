@@ -0,0 +1,165 @@
+"""Runs the StreamScouter tracker without a window and writes what changes as JSON lines.
+
+    python headless.py --game "Minecraft, Fortnite" --count 100
+    python headless.py --game Minecraft --count 500 --output events.jsonl --polls 10
+
+Credentials come from the environment or .env, like the app. Every line is one
+JSON object with an "event" of:
+    joined     a streamer entered the top list ("returned": true if they were still lingering)
+    lingering  a streamer dropped out and their linger countdown started
+    left       a streamer's linger countdown ran out
+    poll       per-poll stats: list sizes, change counts, fetch time and the next interval
+    error      a poll failed (network error or bad response); the next poll is tried after the usual interval
+Only tracking modules are imported here, so no Tk, pystray, pygame or winreg is needed.
+"""
+import argparse
+import json
+import sys
+import time
+
+import requests
+
+from adaptive_interval import AdaptiveInterval
+from cache import PersistentCache
+from settings_manager import SettingsManager
+from streamer_tracker import MultiCategoryTracker
+from twitch_api import TwitchAPI, HELIX_URL
+
+ENV_FILE = ".env"
+PROFILE_CACHE_FILE = "profile_cache.json"
+GAME_CACHE_FILE = "game_cache.json"
+MAX_STREAMER_COUNT = 2000
+
+
+class EventWriter:
+    """Writes one JSON object per line and flushes after every poll."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, event, **fields):
+        fields = {"event": event, "time": round(time.time(), 3), **fields}
+        self.stream.write(json.dumps(fields) + "\n")
+
+    def write_error(self, poll, error):
+        self.write("error", poll=poll, error=f"{type(error).__name__}: {error}")
+        self.stream.flush()
+
+    def write_delta(self, delta, poll, started, fetched, next_interval):
+        for rank, record in delta.added:
+            self.write("joined", rank=rank, **record.as_dict())
+        for record, old_rank, new_rank in delta.moved:
+            if old_rank is None:
+                self.write("joined", rank=new_rank, returned=True, **record.as_dict())
+        for record, countdown in delta.lingering:
+            if countdown == delta.linger_duration:
+                self.write("lingering", countdown=countdown, **record.as_dict())
+        for record in delta.removed:
+            self.write("left", **record.as_dict())
+
+        self.write(
+            "poll",
+            poll=poll,
+            streams=len(delta.current),
+            lingering=len(delta.lingering),
+            joined=len(delta.added),
+            moved=len(delta.moved),
+            left=len(delta.removed),
+            unchanged=delta.unchanged,
+            fetch_ms=round((fetched - started) * 1000, 1),
+            process_ms=round((time.perf_counter() - fetched) * 1000, 1),
+            next_interval=next_interval,
+        )
+        self.stream.flush()
+
+
+def resolve_game_ids(twitch_api, game_name):
+    game_ids = []
+    for name in game_name.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        game_id = twitch_api.get_game_id(name)
+        if not game_id:
+            print(f"Game '{name}' not found on Twitch.", file=sys.stderr)
+        elif game_id not in game_ids:
+            game_ids.append(game_id)
+    return game_ids
+
+
+def run(args, output, settings_manager):
+    # Caches only persist against the real API, so stub runs start clean.
+    persist_caches = args.helix_url == HELIX_URL
+    twitch_api = TwitchAPI(
+        settings_manager.load_env_variable("YOUR_CLIENT_ID"),
+        settings_manager.load_env_variable("YOUR_ACCESS_TOKEN"),
+        game_cache=PersistentCache(GAME_CACHE_FILE if persist_caches else None, ttl=7 * 24 * 60 * 60, max_size=500),
+        profile_cache=PersistentCache(PROFILE_CACHE_FILE if persist_caches else None, ttl=24 * 60 * 60, max_size=5000),
+        client_secret=settings_manager.load_env_variable("YOUR_CLIENT_SECRET"),
+        base_url=args.helix_url,
+    )
+
+    try:
+        game_ids = resolve_game_ids(twitch_api, args.game)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Error looking up games: {e}", file=sys.stderr)
+        return 1
+    if not game_ids:
+        return 1
+
+    tracker = MultiCategoryTracker(twitch_api, None, None)
+    tracker.set_categories(game_ids)
+    poll_interval = AdaptiveInterval(
+        args.min_interval, args.max_interval, default_interval=args.interval, enabled=not args.fixed_interval
+    )
+    writer = EventWriter(output)
+
+    poll = 0
+    while not args.polls or poll < args.polls:
+        poll += 1
+        started = time.perf_counter()
+        try:
+            top_streams_by_game = tracker.get_top_streams(min(args.count, MAX_STREAMER_COUNT))
+        except (requests.RequestException, ValueError) as e:
+            # A failed poll leaves the tracker as it was; try again after the usual wait.
+            writer.write_error(poll, e)
+            next_interval = poll_interval.interval
+        else:
+            fetched = time.perf_counter()
+            delta = tracker.process_streamers(top_streams_by_game)
+            next_interval = poll_interval.update(record.id for record in delta.current)
+            writer.write_delta(delta, poll, started, fetched, next_interval)
+
+        if args.polls and poll >= args.polls:
+            break
+        time.sleep(next_interval)
+    return 0
+
+
+def main():
+    settings_manager = SettingsManager(None, ENV_FILE)
+    parser = argparse.ArgumentParser(description="Track top streamers without the GUI and print JSON-lines events.")
+    parser.add_argument("--game", required=True, help="comma-separated game names")
+    parser.add_argument("--count", type=int, default=100, help=f"streamers to track per game (max {MAX_STREAMER_COUNT})")
+    parser.add_argument("--output", help="append events to this file instead of stdout")
+    parser.add_argument("--polls", type=int, default=0, help="stop after this many polls (0 = run until interrupted)")
+    parser.add_argument("--interval", type=int, default=10, help="seconds between polls before adaptive polling adjusts it")
+    parser.add_argument("--min-interval", type=int, default=5)
+    parser.add_argument("--max-interval", type=int, default=60)
+    parser.add_argument("--fixed-interval", action="store_true", help="always wait --interval seconds")
+    parser.add_argument("--helix-url", default=settings_manager.load_env_variable("HELIX_URL") or HELIX_URL,
+                        help="Helix base URL, e.g. a helix_stub server")
+    args = parser.parse_args()
+
+    output = open(args.output, "a") if args.output else sys.stdout
+    try:
+        sys.exit(run(args, output, settings_manager))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.output:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""Local stand-in for the Helix endpoints StreamScouter uses, plus a recorder for real sessions.
+
+Serve a synthetic scenario:
+    python helix_stub.py serve --games "Minecraft,Fortnite" --streams 500 --churn 0.05 --latency 0.05 --rate-429 0.02
+
+Replay a recorded session:
+    python helix_stub.py serve --replay session.json
+
+Record a real session (uses the credentials from .env):
+    python helix_stub.py record --out session.json --game Minecraft --count 100 --polls 3
+
+Point the app at the stub with HELIX_URL=http://127.0.0.1:8080 (environment or .env).
+"""
+import argparse
+import json
+import random
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+class HelixScenario:
+    """Synthetic Helix data: categories with ranked streams that churn once per poll."""
+
+    def __init__(self, games=("Minecraft",), streams_per_game=300, churn=0.05, latency=0.0, rate_429=0.0,
+                 rate_limit=800, rate_window=60, token_lifetime=None, seed=None):
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.churn = churn
+        self.rate_limit = rate_limit
+        self.rate_window = rate_window
+        self.token_lifetime = token_lifetime
+        self.tokens = {}
+        self.token_count = 0
+        self.next_user = 1
+        self.users = {}
+        self.games = {str(index + 1): name for index, name in enumerate(games)}
+        self.streams = {game_id: [self.new_stream(game_id) for _ in range(streams_per_game)] for game_id in self.games}
+        for game_id in self.games:
+            self.rank(game_id)
+        self.budget = rate_limit
+        self.window_reset = time.time() + rate_window
+
+    def new_stream(self, game_id):
+        user_id = str(self.next_user)
+        self.next_user += 1
+        login = f"streamer{user_id}"
+        self.users[user_id] = {"id": user_id, "login": login, "display_name": login.capitalize(),
+                               "profile_image_url": f"/avatars/{user_id}.png"}
+        return {"user_id": user_id, "user_login": login, "user_name": login.capitalize(), "game_id": game_id,
+                "game_name": self.games[game_id], "viewer_count": self.random.randint(1, 50000)}
+
+    def rank(self, game_id):
+        self.streams[game_id].sort(key=lambda stream: -stream["viewer_count"])
+
+    def tick(self, game_ids):
+        """Churn the given categories: replace a share of streams and shuffle viewer counts."""
+        with self.lock:
+            for game_id in game_ids:
+                streams = self.streams.get(game_id)
+                if not streams:
+                    continue
+                changes = int(round(len(streams) * self.churn))
+                for _ in range(changes):
+                    streams[self.random.randrange(len(streams))] = self.new_stream(game_id)
+                for stream in self.random.sample(streams, min(changes, len(streams))):
+                    stream["viewer_count"] = max(1, int(stream["viewer_count"] * self.random.uniform(0.5, 1.5)))
+                self.rank(game_id)
+
+    def issue_token(self):
+        with self.lock:
+            self.token_count += 1
+            token = f"stub-token-{self.token_count}"
+            self.tokens[token] = time.time() + self.token_lifetime if self.token_lifetime else None
+            return token
+
+    def token_valid(self, authorization):
+        """Any bearer token is accepted unless token_lifetime is set; then only unexpired issued ones are."""
+        if not self.token_lifetime:
+            return True
+        expires_at = self.tokens.get(authorization.replace("Bearer ", "", 1))
+        return expires_at is not None and expires_at > time.time()
+
+    def spend(self):
+        """Take one point from the rate budget and return (allowed, Ratelimit-* headers)."""
+        with self.lock:
+            now = time.time()
+            if now >= self.window_reset:
+                self.budget = self.rate_limit
+                self.window_reset = now + self.rate_window
+            allowed = self.budget > 0 and self.random.random() >= self.rate_429
+            if allowed:
+                self.budget -= 1
+            headers = {"Ratelimit-Limit": str(self.rate_limit),
+                       "Ratelimit-Remaining": str(self.budget if allowed else 0),
+                       "Ratelimit-Reset": str(int(self.window_reset))}
+            return allowed, headers
+
+    def handle(self, method, path, query):
+        """Answer one request; returns (status, headers, body)."""
+        if path == "/oauth2/token" and method == "POST":
+            return 200, {}, {"access_token": self.issue_token(), "expires_in": self.token_lifetime or 5000000,
+                             "token_type": "bearer"}
+
+        params = {}
+        for key, value in query:
+            params.setdefault(key, []).append(value)
+
+        if path == "/games":
+            names = {name.lower() for name in params.get("name", [])}
+            return 200, {}, {"data": [{"id": game_id, "name": name} for game_id, name in self.games.items()
+                                      if name.lower() in names]}
+        if path == "/search/categories":
+            needle = params.get("query", [""])[0].lower()
+            first = int(params.get("first", [20])[0])
+            found = [{"id": game_id, "name": name} for game_id, name in self.games.items() if needle in name.lower()]
+            return 200, {}, {"data": found[:first], "pagination": {}}
+        if path == "/users":
+            return 200, {}, {"data": [dict(self.users[user_id]) for user_id in params.get("id", []) if user_id in self.users]}
+        if path == "/streams":
+            return 200, {}, self.streams_page(params)
+        return 404, {}, {"error": "Not Found", "status": 404, "message": f"No stub for {path}"}
+
+    def streams_page(self, params):
+        first = min(int(params.get("first", [20])[0]), 100)
+        offset = int(params.get("after", [0])[0])
+        game_ids = params.get("game_id", [])
+        user_ids = set(params.get("user_id", []))
+
+        if offset == 0 and game_ids:
+            # A first page is the start of a new poll.
+            self.tick(game_ids)
+
+        with self.lock:
+            if user_ids:
+                streams = [stream for streams in self.streams.values() for stream in streams
+                           if stream["user_id"] in user_ids]
+            else:
+                streams = [stream for game_id in game_ids for stream in self.streams.get(game_id, [])]
+            streams = sorted(streams, key=lambda stream: -stream["viewer_count"])
+            page = [dict(stream) for stream in streams[offset:offset + first]]
+
+        pagination = {"cursor": str(offset + first)} if offset + first < len(streams) else {}
+        return {"data": page, "pagination": pagination}
+
+
+class FixtureReplay:
+    """Serves recorded responses; repeated identical requests walk through their recordings in order."""
+
+    def __init__(self, path, latency=0.0):
+        with open(path, "r") as f:
+            self.fixtures = json.load(f)
+        self.latency = latency
+        self.rate_429 = 0.0
+        self.lock = threading.Lock()
+        self.positions = {}
+
+    @staticmethod
+    def key(method, path, query):
+        return method, path, tuple(sorted((key, value) for key, value in query))
+
+    def handle(self, method, path, query):
+        key = self.key(method, path, query)
+        matches = [fixture for fixture in self.fixtures
+                   if self.key(fixture["method"], fixture["path"], fixture["query"]) == key]
+        if not matches:
+            return 404, {}, {"error": "Not Found", "status": 404, "message": f"No recording for {path}"}
+        with self.lock:
+            position = self.positions.get(key, 0)
+            self.positions[key] = position + 1
+        fixture = matches[min(position, len(matches) - 1)]
+        return fixture["status"], fixture.get("headers", {}), fixture["body"]
+
+    def token_valid(self, authorization):
+        return True
+
+    def spend(self):
+        return True, {}
+
+
+class HelixStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.respond("GET")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.respond("POST")
+
+    def respond(self, method):
+        backend = self.server.backend
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/")
+        if path.startswith("/helix/"):
+            path = path[len("/helix"):]
+        query = parse_qsl(parts.query, keep_blank_values=True)
+
+        if backend.latency:
+            time.sleep(backend.latency)
+
+        headers = {}
+        if path.startswith("/avatars/"):
+            # Synthetic and replayed users both get placeholder avatars from the stub.
+            name = path.split("/")[-1].split(".")[0]
+            status, extra, body = 200, {"Content-Type": "image/png"}, solid_png(30, 30, int(name) if name.isdigit() else 0)
+        elif path == "/oauth2/token":
+            status, extra, body = backend.handle(method, path, query)
+        elif not backend.token_valid(self.headers.get("Authorization", "")):
+            status, extra, body = 401, {}, {"error": "Unauthorized", "status": 401, "message": "Invalid OAuth token"}
+        else:
+            allowed, headers = backend.spend()
+            if allowed:
+                status, extra, body = backend.handle(method, path, query)
+            else:
+                status, extra, body = 429, {}, {"error": "Too Many Requests", "status": 429, "message": ""}
+        headers.update(extra)
+
+        if path == "/users" and isinstance(body, dict):
+            # Avatars are served by the stub itself, so make their URLs absolute.
+            for user in body.get("data", []):
+                if user.get("profile_image_url", "").startswith("/"):
+                    user["profile_image_url"] = f"http://{self.headers.get('Host')}{user['profile_image_url']}"
+
+        payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", headers.pop("Content-Type", "application/json"))
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class HelixStubServer:
+    """Runs a scenario or replay backend on a local port, in the foreground or a background thread."""
+
+    def __init__(self, backend, host="127.0.0.1", port=0, verbose=False):
+        self.httpd = ThreadingHTTPServer((host, port), HelixStubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.backend = backend
+        self.httpd.verbose = verbose
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class FixtureRecorder:
+    """Captures every Helix response a TwitchAPI session sees into a replayable fixture file."""
+
+    def __init__(self, twitch_api):
+        self.twitch_api = twitch_api
+        self.fixtures = []
+        self.lock = threading.Lock()
+        twitch_api.session.hooks["response"].append(self.record)
+
+    def record(self, response, *args, **kwargs):
+        parts = urlsplit(response.request.url)
+        url = f"{parts.scheme}://{parts.netloc}{parts.path}"
+        if url == self.twitch_api.auth_url:
+            path = "/oauth2/token"
+        elif url.startswith(self.twitch_api.base_url):
+            path = url[len(self.twitch_api.base_url):]
+        else:
+            return
+
+        try:
+            body = response.json()
+        except ValueError:
+            return
+        if path == "/oauth2/token":
+            # Never write a live credential into a fixture.
+            body = dict(body, access_token="recorded-token")
+        elif path == "/users" and isinstance(body, dict):
+            # Replays must not reach the real CDN; the stub serves a placeholder per user.
+            body = dict(body, data=[dict(user, profile_image_url=f"/avatars/{user['id']}.png")
+                                    for user in body.get("data", [])])
+
+        headers = {name: value for name, value in response.headers.items() if name.lower().startswith("ratelimit-")}
+        with self.lock:
+            self.fixtures.append({
+                "method": response.request.method,
+                "path": path,
+                "query": parse_qsl(parts.query, keep_blank_values=True),
+                "status": response.status_code,
+                "headers": headers,
+                "body": body,
+            })
+
+    def save(self, path):
+        with self.lock:
+            with open(path, "w") as f:
+                json.dump(self.fixtures, f, indent=1)
+
+
+def solid_png(width, height, seed):
+    """A small single-colour PNG so avatar downloads work offline without Pillow."""
+    color = bytes(((seed * 67) % 256, (seed * 131) % 256, (seed * 199) % 256, 255))
+    raw = b"".join(b"\x00" + color * width for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b""))
+
+
+def record_session(args):
+    from settings_manager import SettingsManager
+    from streamer_tracker import MultiCategoryTracker
+    from twitch_api import TwitchAPI
+
+    settings_manager = SettingsManager(None, ".env")
+    twitch_api = TwitchAPI(
+        settings_manager.load_env_variable("YOUR_CLIENT_ID"),
+        settings_manager.load_env_variable("YOUR_ACCESS_TOKEN"),
+        client_secret=settings_manager.load_env_variable("YOUR_CLIENT_SECRET"),
+    )
+    recorder = FixtureRecorder(twitch_api)
+    tracker = MultiCategoryTracker(twitch_api, None, None)
+
+    game_ids = [twitch_api.get_game_id(name.strip()) for name in args.game.split(",") if name.strip()]
+    tracker.set_categories([game_id for game_id in game_ids if game_id])
+    for poll in range(args.polls):
+        if poll:
+            time.sleep(args.interval)
+        tracker.process_streamers(tracker.get_top_streams(args.count))
+        print(f"Recorded poll {poll + 1}/{args.polls}")
+    twitch_api.search_categories(args.game.split(",")[0].strip())
+    recorder.save(args.out)
+    print(f"Saved {len(recorder.fixtures)} responses to {args.out}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Helix stand-in for StreamScouter.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="serve a synthetic scenario or a recorded fixture")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--games", default="Minecraft", help="comma-separated category names")
+    serve.add_argument("--streams", type=int, default=300, help="streams per category")
+    serve.add_argument("--churn", type=float, default=0.05, help="share of each category replaced per poll")
+    serve.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    serve.add_argument("--rate-429", type=float, default=0.0, help="probability of a spurious 429")
+    serve.add_argument("--rate-limit", type=int, default=800, help="requests per rate window")
+    serve.add_argument("--token-lifetime", type=float, default=None, help="expire issued tokens after N seconds")
+    serve.add_argument("--seed", type=int, default=None)
+    serve.add_argument("--replay", help="serve responses from a recorded fixture file instead")
+    serve.add_argument("--verbose", action="store_true")
+
+    record = commands.add_parser("record", help="record a real Helix session into a fixture file")
+    record.add_argument("--out", required=True)
+    record.add_argument("--game", required=True, help="comma-separated category names")
+    record.add_argument("--count", type=int, default=100)
+    record.add_argument("--polls", type=int, default=3)
+    record.add_argument("--interval", type=float, default=10)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record_session(args)
+        return
+
+    if args.replay:
+        backend = FixtureReplay(args.replay, latency=args.latency)
+    else:
+        backend = HelixScenario(
+            games=[name.strip() for name in args.games.split(",") if name.strip()],
+            streams_per_game=args.streams, churn=args.churn, latency=args.latency, rate_429=args.rate_429,
+            rate_limit=args.rate_limit, token_lifetime=args.token_lifetime, seed=args.seed,
+        )
+    server = HelixStubServer(backend, args.host, args.port, verbose=args.verbose)
+    print(f"Helix stub listening on {server.base_url} (set HELIX_URL to this)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
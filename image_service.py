@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+THUMBNAIL_SIZE = (30, 30)
+
+
+class ImageService:
+    """Loads streamer avatars once and shares them as PhotoImages across every canvas.
+
+    Downloads and decoding run on a small worker pool; a URL that is already
+    being fetched is not fetched again. Decoded images live in an LRU keyed by
+    URL and are refcounted: every on_ready() delivery holds one reference until
+    release(url), and only unreferenced images are evicted. With a
+    ThumbnailStore, shrunk avatars are kept on disk so later runs skip the
+    download and decode. get(), release() and the on_ready callbacks all run
+    on the Tk thread; dispatch(fn) must run fn there. PIL is imported on first
+    use, so it stays off the startup path until the first row is drawn.
+    """
+
+    def __init__(self, fetch_image, dispatch, workers=4, max_images=300, size=THUMBNAIL_SIZE, store=None):
+        self.fetch_image = fetch_image
+        self.store = store
+        self.dispatch = dispatch
+        self.workers = workers
+        self.max_images = max_images
+        self.size = size
+        self.executor = None
+        self.images = OrderedDict()
+        self.waiting = {}
+        self.placeholder_image = None
+
+    @property
+    def placeholder(self):
+        """Blank image shown until the avatar arrives (or if it never does)."""
+        if self.placeholder_image is None:
+            from PIL import Image, ImageTk
+            self.placeholder_image = ImageTk.PhotoImage(Image.new("RGBA", self.size, (74, 74, 74, 255)))
+        return self.placeholder_image
+
+    def get(self, image_url, on_ready):
+        """Call on_ready(photo_image) once the avatar for image_url is decoded and return the image to show meanwhile.
+
+        Cached images are delivered right away. Each delivery takes a
+        reference that the caller gives back with release(image_url).
+        """
+        entry = self.images.get(image_url)
+        if entry:
+            self.images.move_to_end(image_url)
+            entry[1] += 1
+            on_ready(entry[0])
+            return entry[0]
+
+        waiters = self.waiting.get(image_url)
+        if waiters is not None:
+            waiters.append(on_ready)
+            return self.placeholder
+
+        self.waiting[image_url] = [on_ready]
+        if not self.executor:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-fetch")
+        self.executor.submit(self.load, image_url)
+        return self.placeholder
+
+    def release(self, image_url):
+        """Drop one reference taken by an on_ready() delivery."""
+        entry = self.images.get(image_url)
+        if entry and entry[1] > 0:
+            entry[1] -= 1
+            self.evict()
+
+    def load(self, image_url):
+        """Worker side: read the avatar from the store or download and shrink it, then hand it to the Tk thread."""
+        try:
+            from PIL import Image
+            pixels = self.store.get(image_url) if self.store is not None else None
+            if pixels:
+                image = Image.frombytes("RGBA", self.size, pixels)
+            else:
+                image = self.decode(self.fetch_image(image_url))
+                if self.store is not None:
+                    self.store.put(image_url, image.tobytes())
+        except Exception as e:
+            print(f"Error loading image {image_url}: {e}")
+            image = None
+        self.dispatch(lambda: self.deliver(image_url, image))
+
+    def decode(self, data):
+        from PIL import Image
+        image = Image.open(BytesIO(data))
+        # Let JPEG decode at a reduced scale instead of the full 300x300 source.
+        image.draft("RGB", (self.size[0] * 2, self.size[1] * 2))
+        return image.convert("RGBA").resize(self.size)
+
+    def deliver(self, image_url, image):
+        waiters = self.waiting.pop(image_url, [])
+        if image is None:
+            return
+
+        from PIL import ImageTk
+        photo_image = ImageTk.PhotoImage(image)
+        self.images[image_url] = [photo_image, len(waiters)]
+        for on_ready in waiters:
+            on_ready(photo_image)
+        self.evict()
+
+    def evict(self):
+        """Drop the least recently used unreferenced images while over max_images."""
+        excess = len(self.images) - self.max_images
+        if excess <= 0:
+            return
+        for image_url in [url for url, (_, refcount) in self.images.items() if refcount == 0][:excess]:
+            del self.images[image_url]
+
+    def __len__(self):
+        return len(self.images)
@@ -3,22 +3,27 @@ from tkinter import ttk
 import sys
 import os
 import webbrowser
-from PIL import Image, ImageTk
-import requests
-from io import BytesIO
-import threading
 import CheckForUpdate
-from threading import Timer
+from category_search import CategorySearch
+from virtual_list import VirtualList
+from image_service import ImageService
 
 class Layout:
-    def __init__(self, root, config, callbacks, twitch_api):
+    def __init__(self, root, config, callbacks, twitch_api, ui_queue, thumbnail_store=None):
         self.root = root
+        self.ui_queue = ui_queue
         self.config = config
         self.callbacks = callbacks
         self.twitch_api = twitch_api
-        self.total_streamers_count = 0
         self.dropdown_window = None
-        self.search_timer = None
+        # Row widgets by streamer id, one dict per canvas frame.
+        self.row_index = {}
+        self.image_service = ImageService(
+            twitch_api.fetch_image, dispatch=self.ui_queue.push, store=thumbnail_store
+        )
+        self.category_search = CategorySearch(
+            twitch_api, on_results=self.show_dropdown, dispatch=lambda fn: self.ui_queue.push(fn, key="category_results")
+        )
         self.initialize_layout()
 
     def initialize_layout(self):
@@ -49,7 +54,7 @@ class Layout:
         self.tab_control.pack(expand=1, fill="both")
 
         # Main tab layout
-        tk.Label(self.main_tab, text="Enter Game Name:").pack()
+        tk.Label(self.main_tab, text="Enter Game Name(s), comma separated:").pack()
         self.game_entry = tk.Entry(self.main_tab)
         self.game_entry.insert(0, self.config['default_game'] or "") 
         self.game_entry.pack(fill=tk.X, padx=10)
@@ -104,7 +109,8 @@ class Layout:
         tk.Label(self.log_tab, text="Activity Log", font=("Arial", 14)).pack(pady=10)
         log_frame = tk.Frame(self.log_tab)
         log_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        self.log_canvas, self.log_canvas_frame = self.generate_canvas(log_frame)
+        # The log only grows, so it renders just the rows in view.
+        self.log_list = VirtualList(log_frame, self.image_service)
 
         # Settings tab layout
         tk.Label(self.settings_tab, text="Client ID:").pack()
@@ -196,42 +202,62 @@ class Layout:
                         highlightthickness=1
                     )
 
-    def add_item_to_main_canvas(self, text, link=None, image_url=None, linger_duration=None, remaining_linger=None):
-        if linger_duration and remaining_linger is not None and linger_duration > 0:
-            color1 = (129, 90, 192)  # purple
-            color2 = (255, 0, 0)  # red
-            ratio = max(0, min(remaining_linger / linger_duration, 1))
-            r = int(color2[0] * (1 - ratio) + color1[0] * ratio)
-            g = int(color2[1] * (1 - ratio) + color1[1] * ratio)
-            b = int(color2[2] * (1 - ratio) + color1[2] * ratio)
-            bg_color = f"#{r:02x}{g:02x}{b:02x}"
-        else:
-            bg_color = "#2e2e2e"
-
-        existing_widgets = {
-            getattr(widget, "streamer_id", None): widget
-            for widget in self.canvas_frame.winfo_children()
-            if widget.winfo_exists()
-        }
-
-        streamer_id = text
-        if remaining_linger == 0:
-            widget = existing_widgets[streamer_id]
-            widget.destroy()
-
-        if streamer_id in existing_widgets:
-            widget = existing_widgets[streamer_id]
-            widget.pack_forget()
-            widget.pack(fill=tk.X)
-            widget.configure(bg=bg_color)
-            for child in widget.winfo_children():
-                if hasattr(child, "configure"):
-                    child.configure(bg=bg_color)
-        else:
-            item_frame = self.create_item_frame(self.canvas_frame, streamer_id, text, link, image_url, bg_color)
-
-        # Add the streamer to the log canvas
-        self.add_item_to_log_canvas(streamer_id=text, text=text, link=link, image_url=image_url)
+    def apply_delta(self, delta):
+        """Apply one tracker tick to the Tracker tab, touching only the rows that changed."""
+        rows = self.rows_for(self.canvas_frame)
+
+        for record in delta.removed:
+            row = rows.pop(record.id, None)
+            if row:
+                row.destroy()
+
+        for record, countdown in delta.lingering:
+            row = rows.get(record.id)
+            if not row:
+                continue
+            if countdown == delta.linger_duration:
+                # Just dropped out of the top list: move the row below the live ones.
+                row.pack_forget()
+                row.pack(fill=tk.X)
+            self.set_row_color(row, self.linger_color(countdown, delta.linger_duration))
+
+        placements = [(rank, record) for rank, record in delta.added]
+        placements += [(new_rank, record) for record, _, new_rank in delta.moved]
+        placements.sort(key=lambda placement: placement[0])
+
+        # Placing rows in rank order, each right after its new predecessor,
+        # restores the full order without touching rows that kept their place.
+        for rank, record in placements:
+            row = rows.get(record.id)
+            if row is None:
+                row = self.create_item_frame(self.canvas_frame, record.id, record.name, record.link, record.profile_picture)
+                self.add_item_to_log_canvas(record.id, record.name, record.link, record.profile_picture)
+            else:
+                self.set_row_color(row, "#2e2e2e")
+
+            if rank == 0:
+                first_row = self.canvas_frame.pack_slaves()[0]
+                if first_row is not row:
+                    row.pack(fill=tk.X, before=first_row)
+            else:
+                row.pack(fill=tk.X, after=rows[delta.current[rank - 1].id])
+
+    @staticmethod
+    def linger_color(remaining_linger, linger_duration):
+        """Fade a lingering row from purple to red as its countdown runs out."""
+        color1 = (129, 90, 192)  # purple
+        color2 = (255, 0, 0)  # red
+        ratio = max(0, min(remaining_linger / linger_duration, 1))
+        r = int(color2[0] * (1 - ratio) + color1[0] * ratio)
+        g = int(color2[1] * (1 - ratio) + color1[1] * ratio)
+        b = int(color2[2] * (1 - ratio) + color1[2] * ratio)
+        return f"#{r:02x}{g:02x}{b:02x}"
+
+    def set_row_color(self, widget, bg_color):
+        widget.configure(bg=bg_color)
+        for child in widget.winfo_children():
+            if hasattr(child, "configure"):
+                child.configure(bg=bg_color)
 
     def add_text_only_item(self, item_frame, text, link, bg_color):
         text_label = tk.Label(item_frame, text=text, bg=bg_color, fg="#ffffff", anchor="w", cursor="hand2" if link else "arrow")
@@ -242,81 +268,92 @@ class Layout:
 
     def add_item_to_log_canvas(self, streamer_id, text, link=None, image_url=None):
         """Add a streamer to the log canvas, ensuring only one instance of each streamer."""
-        existing_widgets = {
-            getattr(widget, "streamer_id", None): widget
-            for widget in self.log_canvas_frame.winfo_children()
-            if widget.winfo_exists()
-        }
+        self.log_list.append({"id": streamer_id, "name": text, "link": link, "profile_picture": image_url})
 
-        if streamer_id in existing_widgets:
-            return
-        
-        self.create_item_frame(self.log_canvas_frame, streamer_id, text, link, image_url)
+    def add_item_to_pinned_canvas(self, streamer_id, text, link=None, image_url=None):
+        """Add a streamer to the pinned canvas, or refresh their row if it is already shown."""
+        row = self.rows_for(self.pin_canvas_frame).get(streamer_id)
+        if row is None:
+            self.create_item_frame(self.pin_canvas_frame, streamer_id, text, link, image_url)
+        else:
+            self.update_item_frame(row, text, link, image_url)
 
-        self.log_canvas.update_idletasks()
-        self.log_canvas.configure(scrollregion=self.log_canvas.bbox("all"))
+    def remove_item_from_pinned_canvas(self, streamer_id):
+        """Remove a pinned streamer's row once they go offline."""
+        row = self.rows_for(self.pin_canvas_frame).pop(streamer_id, None)
+        if row:
+            row.destroy()
 
-    def add_item_to_pinned_canvas(self, streamer_id, text, link=None, image_url=None):
-        """Add a streamer to the pinned canvas."""
-        item_frame = self.create_item_frame(self.pin_canvas_frame, streamer_id, text, link, image_url)
+    def rows_for(self, parent_canvas):
+        """Return the live streamer id -> row widget index of a canvas frame."""
+        return self.row_index.setdefault(parent_canvas, {})
 
-    def create_item_frame(self, parent_canvas, streamer_id, text, link=None, image_url=None, bg_color="#2e2e2e"):
-        """Create an item frame with optional image and text."""
-        item_frame = tk.Frame(parent_canvas, bg=bg_color)
-        item_frame.pack(fill=tk.X)
-        item_frame.streamer_id = streamer_id
+    def register_row(self, parent_canvas, item_frame):
+        """Index a new row under its streamer id and drop it from the index once destroyed."""
+        rows = self.rows_for(parent_canvas)
+        rows[item_frame.streamer_id] = item_frame
 
-        def load_image():
-            try:
-                response = requests.get(image_url, timeout=5)
-                response.raise_for_status()
-                img_data = BytesIO(response.content)
-                img = Image.open(img_data).resize((30, 30))
-                tk_img = ImageTk.PhotoImage(img)
+        def forget(event):
+            if rows.get(item_frame.streamer_id) is item_frame:
+                del rows[item_frame.streamer_id]
 
-                def update_ui():
-                    img_label = tk.Label(item_frame, image=tk_img, bg=bg_color, cursor="hand2" if link else "arrow")
-                    img_label.image = tk_img
-                    img_label.pack(side=tk.LEFT)
+        item_frame.bind("<Destroy>", forget, add="+")
 
-                    if link:
-                        img_label.bind("<Button-1>", lambda e: webbrowser.open(link))
+    def add_image_label(self, item_frame, image_url, link, bg_color):
+        """Show the shared avatar for image_url, with a placeholder until it has loaded."""
+        img_label = tk.Label(item_frame, bg=bg_color, cursor="hand2" if link else "arrow")
+        img_label.pack(side=tk.LEFT)
+        img_label.image_url = None
 
-                    text_label = tk.Label(item_frame, text=text, bg=bg_color, fg="#ffffff", anchor="w", cursor="hand2" if link else "arrow")
-                    text_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        if link:
+            img_label.bind("<Button-1>", lambda e: webbrowser.open(link))
+
+        def on_ready(photo_image):
+            if not img_label.winfo_exists():
+                self.image_service.release(image_url)
+                return
+            img_label.configure(image=photo_image)
+            img_label.image = photo_image
+            img_label.image_url = image_url
 
-                    if link:
-                        text_label.bind("<Button-1>", lambda e: webbrowser.open(link))
+        def on_destroy(event):
+            if img_label.image_url:
+                self.image_service.release(img_label.image_url)
+                img_label.image_url = None
 
-                self.root.after(0, update_ui)
-            except Exception as e:
-                self.root.after(0, lambda: self.add_text_only_item(item_frame, text, link, bg_color))
+        img_label.bind("<Destroy>", on_destroy)
+        img_label.configure(image=self.image_service.get(image_url, on_ready))
+
+    def create_item_frame(self, parent_canvas, streamer_id, text, link=None, image_url=None, bg_color="#2e2e2e"):
+        """Create an item frame with optional image and text."""
+        item_frame = tk.Frame(parent_canvas, bg=bg_color)
+        item_frame.pack(fill=tk.X)
+        item_frame.streamer_id = streamer_id
+        item_frame.details = (text, link, image_url)
+        self.register_row(parent_canvas, item_frame)
 
         if image_url:
-            threading.Thread(target=load_image, daemon=True).start()
-        else:
-            self.add_text_only_item(item_frame, text, link, bg_color)
-        
-        return item_frame
+            self.add_image_label(item_frame, image_url, link, bg_color)
+        self.add_text_only_item(item_frame, text, link, bg_color)
 
-    def search_categories(self, event):
-        """Search for categories based on the live input in the game entry field."""
-        if self.search_timer:
-            self.search_timer.cancel() 
+        return item_frame
 
-        query = self.game_entry.get().strip()
-        if not query:
-            self.clear_dropdown()
+    def update_item_frame(self, item_frame, text, link=None, image_url=None):
+        """Redraw a row's avatar and name in place, keeping its position; unchanged rows are left alone."""
+        if item_frame.details == (text, link, image_url):
             return
+        item_frame.details = (text, link, image_url)
+        bg_color = item_frame.cget("bg")
+        for child in item_frame.winfo_children():
+            child.destroy()
+        if image_url:
+            self.add_image_label(item_frame, image_url, link, bg_color)
+        self.add_text_only_item(item_frame, text, link, bg_color)
 
-        # Set a timer to delay the search
-        self.search_timer = Timer(0.3, lambda: self.perform_search(query))
-        self.search_timer.start()
-
-    def perform_search(self, query):
-        """Perform the actual search for categories."""
-        categories = self.twitch_api.search_categories(query)
-        self.show_dropdown(categories)
+    def search_categories(self, event):
+        """Search for categories based on the live input in the game entry field."""
+        # Several categories are entered comma separated; only the one being typed is searched.
+        self.category_search.search(self.game_entry.get().split(",")[-1])
 
     def show_dropdown(self, categories):
         """Display the dropdown menu as a floating window."""
@@ -374,8 +411,10 @@ class Layout:
 
     def select_category(self, category_name):
         """Auto-fill the game entry field with the selected category and clear the dropdown."""
+        self.category_search.cancel()
+        game_names = [name.strip() for name in self.game_entry.get().split(",")[:-1]]
         self.game_entry.delete(0, tk.END)
-        self.game_entry.insert(0, category_name)
+        self.game_entry.insert(0, ", ".join(game_names + [category_name]))
         self.clear_dropdown()
 
     def clear_dropdown(self):
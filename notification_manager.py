@@ -1,32 +1,124 @@
 import os
 import threading
-import pygame
+import time
 
 class NotificationManager:
-    def __init__(self, sound_file, volume_var):
+    """Plays the alert sound from one audio thread, with the mixer set up once and decoded sounds cached per file.
+
+    Alerts fired within coalesce_window seconds of the last one that played
+    are dropped. pygame is only imported by the audio thread, so it costs
+    nothing at startup. check_notifications.py exercises it through SDL's dummy
+    audio driver, without a sound device.
+    """
+
+    def __init__(self, sound_file, volume_var, coalesce_window=1.0, default_file="default.wav"):
         self.sound_file = sound_file
         self.volume_var = volume_var
+        self.coalesce_window = coalesce_window
+        self.default_file = default_file
+        # Tk variables may only be read on the Tk thread, so keep copies the audio thread can use.
+        self.selected_file = sound_file.get()
+        self.volume = volume_var.get()
+        self.sounds = {}
+        self.lock = threading.Lock()
+        self.alert = threading.Event()
+        self.worker = None
+        self.requested = False
+        self.mixer_ready = None
+        self.pygame = None
+        self.last_played = 0
+        self.played = 0
+        sound_file.trace_add("write", self.on_sound_file_changed)
+        volume_var.trace_add("write", self.on_volume_changed)
+
+    def on_sound_file_changed(self, *args):
+        with self.lock:
+            self.selected_file = self.sound_file.get()
+            self.sounds.clear()
+
+    def on_volume_changed(self, *args):
+        try:
+            self.volume = self.volume_var.get()
+        except Exception:
+            pass
+
+    def preload(self):
+        """Start the audio thread, which initialises the mixer and decodes the current sound."""
+        self.start_worker()
+        self.alert.set()
 
     def play_notification(self):
-        file_to_play = self.sound_file.get()
+        """Queue an alert; returns at once and the audio thread plays it."""
+        self.start_worker()
+        self.requested = True
+        self.alert.set()
 
-        if not os.path.exists(file_to_play):
-            print(f"Selected file '{file_to_play}' not found, using 'default.wav'")
-            file_to_play = "default.wav"
+    def start_worker(self):
+        with self.lock:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self.run, name="notification-audio", daemon=True)
+                self.worker.start()
 
-        if not os.path.exists(file_to_play):
-            print("Error: Notification sound file not found! No sound will play.")
-            return  
+    def run(self):
+        while True:
+            self.alert.wait()
+            self.alert.clear()
+            sound = self.get_sound()
+            if not self.requested:
+                continue
+            self.requested = False
 
-        print(f"Playing notification sound: {file_to_play} at volume: {self.volume_var.get()}")
+            now = time.monotonic()
+            if sound is None or now - self.last_played < self.coalesce_window:
+                continue
+            self.last_played = now
+            self.played += 1
+            print(f"Playing notification sound at volume: {self.volume}")
+            sound.set_volume(self.volume)
+            sound.play()
 
-        def play_sound():
+    def init_mixer(self):
+        if self.mixer_ready is None:
             try:
+                import pygame
+                self.pygame = pygame
                 pygame.mixer.init()
-                sound = pygame.mixer.Sound(file_to_play)
-                sound.set_volume(self.volume_var.get())  
-                sound.play()
+                self.mixer_ready = True
+            except ImportError as e:
+                print(f"Error loading pygame, notifications will be silent: {e}")
+                self.mixer_ready = False
             except pygame.error as e:
+                print(f"Error initialising audio, notifications will be silent: {e}")
+                self.mixer_ready = False
+        return self.mixer_ready
+
+    def get_sound(self):
+        """Return the decoded Sound for the selected file (or the default), loading it on first use."""
+        if not self.init_mixer():
+            return None
+
+        with self.lock:
+            selected_file = self.selected_file
+            if selected_file in self.sounds:
+                return self.sounds[selected_file]
+
+        file_to_play = selected_file
+        if not os.path.exists(file_to_play):
+            print(f"Selected file '{file_to_play}' not found, using '{self.default_file}'")
+            file_to_play = self.default_file
+
+        sound = None
+        if not os.path.exists(file_to_play):
+            print("Error: Notification sound file not found! No sound will play.")
+        else:
+            try:
+                sound = self.pygame.mixer.Sound(file_to_play)
+            except self.pygame.error as e:
                 print(f"Error loading sound file: {e}")
 
-        threading.Thread(target=play_sound, daemon=True).start()
\ No newline at end of file
+        with self.lock:
+            # Only cache a sound that loaded, and only if the selection didn't
+            # change while decoding; a missing file is looked for again next time.
+            if sound is not None and self.selected_file == selected_file:
+                self.sounds[selected_file] = sound
+        return sound
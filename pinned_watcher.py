@@ -0,0 +1,58 @@
+import os
+
+class PinnedWatcher:
+    """Follows the live status of a pinned roster, 100 streamers per /helix/streams request."""
+
+    def __init__(self, twitch_api, pinned_file):
+        self.twitch_api = twitch_api
+        self.pinned_file = pinned_file
+        self.pinned_ids = self.load_pinned()
+        self.live_streams = {}
+
+    def load_pinned(self):
+        """Load pinned user IDs, one per line."""
+        if not os.path.exists(self.pinned_file):
+            return []
+        with open(self.pinned_file, "r") as f:
+            pinned_ids = [line.strip() for line in f if line.strip()]
+        return list(dict.fromkeys(pinned_ids))
+
+    def save_pinned(self):
+        with open(self.pinned_file, "w") as f:
+            f.write("\n".join(self.pinned_ids))
+
+    def pin(self, user_id):
+        if user_id not in self.pinned_ids:
+            self.pinned_ids.append(user_id)
+            self.save_pinned()
+
+    def unpin(self, user_id):
+        if user_id in self.pinned_ids:
+            self.pinned_ids.remove(user_id)
+            self.save_pinned()
+
+    def poll(self):
+        """Check the roster once and return only the ("online"|"offline", stream) transitions since the last poll."""
+        pinned_ids = set(self.pinned_ids)
+        if not pinned_ids and not self.live_streams:
+            return []
+
+        live_streams, unknown_ids = self.twitch_api.get_live_streams(list(pinned_ids))
+        # Streamers already known live keep their entry; ids whose batch failed
+        # keep their last known state instead of being reported offline.
+        for user_id in set(live_streams) | unknown_ids:
+            if user_id in self.live_streams:
+                live_streams[user_id] = self.live_streams[user_id]
+
+        went_online = [user_id for user_id in live_streams if user_id not in self.live_streams]
+        went_offline = [user_id for user_id in self.live_streams if user_id not in live_streams]
+
+        if went_online:
+            profile_pictures = self.twitch_api.get_profile_pictures(went_online)
+            for user_id in went_online:
+                live_streams[user_id]["profile_picture"] = profile_pictures.get(user_id)
+
+        transitions = [("online", live_streams[user_id]) for user_id in went_online]
+        transitions += [("offline", self.live_streams[user_id]) for user_id in went_offline]
+        self.live_streams = live_streams
+        return transitions
@@ -0,0 +1,69 @@
+import threading
+import time
+
+class RateLimiter:
+    """Shared request budget driven by the Helix Ratelimit-* response headers."""
+
+    def __init__(self, fallback_wait=1.0):
+        self.fallback_wait = fallback_wait
+        self.lock = threading.Lock()
+        self.limit = None
+        self.remaining = None
+        self.reset_at = 0.0
+        self.resume_at = 0.0
+
+    def reserve(self):
+        """Spend one request from the budget and return how many seconds to wait before sending it."""
+        with self.lock:
+            now = time.time()
+            if self.remaining is not None:
+                if self.remaining <= 0:
+                    # Budget is gone: everyone queues behind the refill time.
+                    self.resume_at = max(self.resume_at, self.reset_at, now)
+                    self.remaining = self.limit or 1
+                self.remaining -= 1
+            return max(0.0, self.resume_at - now)
+
+    def acquire(self):
+        """Block only while the budget is exhausted."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def update(self, headers):
+        """Sync the budget with the Ratelimit-Limit/Remaining/Reset headers of a response."""
+        try:
+            limit = int(headers["Ratelimit-Limit"])
+            remaining = int(headers["Ratelimit-Remaining"])
+            reset_at = float(headers["Ratelimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self.lock:
+            self.limit = limit
+            if self.remaining is None or reset_at > self.reset_at:
+                self.remaining = remaining
+            else:
+                # Responses can land out of order; our own count already
+                # includes requests still in flight.
+                self.remaining = min(self.remaining, remaining)
+            self.reset_at = max(self.reset_at, reset_at)
+
+    def after_response(self, status, headers, can_retry):
+        """Feed one Helix response to the budget; return True for a 429 that should be sent again."""
+        if status != 429:
+            self.update(headers)
+            return False
+        if can_retry:
+            self.throttled(headers)
+        return can_retry
+
+    def throttled(self, headers):
+        """Record a 429 so every caller waits for the bucket to refill."""
+        self.update(headers)
+        with self.lock:
+            now = time.time()
+            self.remaining = 0
+            if self.reset_at <= now:
+                self.reset_at = now + self.fallback_wait
+            self.resume_at = max(self.resume_at, self.reset_at)
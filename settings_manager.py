@@ -1,43 +1,189 @@
+import json
 import os
+import threading
+
+SETTINGS_VERSION = 1
+
+# Every known setting with its default; loaded values are coerced to the default's type.
+DEFAULT_SETTINGS = {
+    "game_name": "",
+    "streamer_count": 3,
+    "width": 300,
+    "height": 400,
+    "notify": False,
+    "sound_file": "default.wav",
+    "volume": 0.5,
+    "launch_at_startup": False,
+    "x": 100,
+    "y": 100,
+    "adaptive_polling": True,
+    "min_poll_interval": 5,
+    "max_poll_interval": 60,
+    "poll_interval": 10,
+}
+
+# Order of the lines in the old positional settings.txt.
+LEGACY_KEYS = ["game_name", "streamer_count", "width", "height", "notify", "sound_file", "volume", "launch_at_startup", "x", "y"]
 
 class SettingsManager:
-    def __init__(self, settings_file, env_file):
+    """Settings kept in memory and written to a versioned JSON file shortly after they change.
+
+    Writes are debounced by save_delay seconds and go through a temp file and
+    os.replace, so a crash mid-write never leaves a half-written file; call
+    flush() before exiting. A legacy positional settings.txt is migrated on
+    first load. The .env file is read once as well.
+    """
+
+    def __init__(self, settings_file, env_file, legacy_settings_file=None, save_delay=1.0):
         self.settings_file = settings_file
         self.env_file = env_file
+        self.legacy_settings_file = legacy_settings_file
+        self.save_delay = save_delay
+        self.settings = dict(DEFAULT_SETTINGS)
+        self.env = None
+        self.lock = threading.Lock()
+        self.save_timer = None
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        if not self.settings_file:
+            return
+
+        if os.path.exists(self.settings_file):
+            try:
+                with open(self.settings_file, "r") as f:
+                    data = json.load(f)
+                self.apply(self.migrate(data))
+                return
+            except (OSError, ValueError, TypeError) as e:
+                print(f"Error loading settings '{self.settings_file}': {e}")
+
+        if self.legacy_settings_file and os.path.exists(self.legacy_settings_file):
+            legacy = self.load_legacy()
+            if legacy:
+                self.apply(legacy)
+                self.dirty = True
+                self.flush()
+                print(f"Migrated '{self.legacy_settings_file}' to '{self.settings_file}'")
+
+    def migrate(self, data):
+        """Bring a loaded settings document up to SETTINGS_VERSION and return its settings dict."""
+        version = data.get("version", 0)
+        settings = data.get("settings", {})
+        # Future format changes add their upgrade steps here, oldest first.
+        if version > SETTINGS_VERSION:
+            print(f"Settings file is version {version}, newer than {SETTINGS_VERSION}; unknown settings are ignored.")
+        return settings
+
+    def load_legacy(self):
+        try:
+            with open(self.legacy_settings_file, "r") as f:
+                lines = [line.strip() for line in f.readlines()]
+        except OSError as e:
+            print(f"Error loading settings '{self.legacy_settings_file}': {e}")
+            return None
+        if len(lines) < len(LEGACY_KEYS):
+            return None
+        return dict(zip(LEGACY_KEYS, lines))
+
+    def apply(self, values):
+        """Take known settings from values, coerced to their default's type; bad values keep the current one."""
+        for key, value in values.items():
+            if key not in DEFAULT_SETTINGS:
+                continue
+            try:
+                self.settings[key] = self.coerce(value, DEFAULT_SETTINGS[key])
+            except (TypeError, ValueError):
+                print(f"Ignoring invalid setting {key}={value!r}")
+
+    @staticmethod
+    def coerce(value, default):
+        if isinstance(default, bool):
+            return value if isinstance(value, bool) else str(value).strip().lower() == "true"
+        if isinstance(default, int):
+            return int(float(value))
+        if isinstance(default, float):
+            return float(value)
+        return str(value)
+
+    def get(self, key, default=None):
+        with self.lock:
+            return self.settings.get(key, default)
+
+    def update(self, **values):
+        """Change settings in memory and schedule a write."""
+        with self.lock:
+            previous = dict(self.settings)
+            self.apply(values)
+            if self.settings != previous:
+                self.dirty = True
+                self.schedule_save()
+
+    def schedule_save(self):
+        """(Re)start the debounce timer; call with the lock held."""
+        if self.save_timer:
+            self.save_timer.cancel()
+        self.save_timer = threading.Timer(self.save_delay, self.flush)
+        self.save_timer.daemon = True
+        self.save_timer.start()
+
+    def flush(self):
+        """Write pending changes now (atomically) and cancel the debounce timer."""
+        with self.lock:
+            if self.save_timer:
+                self.save_timer.cancel()
+                self.save_timer = None
+            if not self.dirty or not self.settings_file:
+                return
+            data = {"version": SETTINGS_VERSION, "settings": dict(self.settings)}
+            self.dirty = False
+
+        temp_path = f"{self.settings_file}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.settings_file)
+        except OSError as e:
+            print(f"Error saving settings '{self.settings_file}': {e}")
 
     def save_settings(self, game_name, streamer_count, width, height, notify_var, sound_file, volume_var, launch_at_startup=False, x=0, y=0):
-        with open(self.settings_file, "w") as f:
-            f.write(f"{game_name}\n{streamer_count}\n{width}\n{height}\n")
-            f.write(f"{notify_var.get()}\n{sound_file.get()}\n{volume_var.get()}\n")
-            f.write(f"{launch_at_startup}\n")
-            f.write(f"{x}\n{y}\n")
+        self.update(
+            game_name=game_name, streamer_count=streamer_count, width=width, height=height,
+            notify=notify_var.get(), sound_file=sound_file.get(), volume=volume_var.get(),
+            launch_at_startup=launch_at_startup, x=x, y=y,
+        )
 
     def load_settings(self):
-        if os.path.exists(self.settings_file):
-            with open(self.settings_file, "r") as f:
-                lines = f.readlines()
-                if len(lines) >= 10:
-                    return (
-                        lines[0].strip(),
-                        int(lines[1].strip()),
-                        lines[2].strip(),
-                        lines[3].strip(),
-                        lines[4].strip().lower() == "true",
-                        lines[5].strip(),
-                        float(lines[6].strip()),
-                        lines[7].strip().lower() == "true",
-                        int(lines[8].strip()),
-                        int(lines[9].strip())
-                    )
-        return "", 3, "300", "400", False, "default.wav", 0.5, False, 100, 100
+        with self.lock:
+            return tuple(self.settings[key] for key in LEGACY_KEYS)
 
     def load_setting(self, key, default):
         """Load a specific setting by key."""
-        settings = self.load_settings()
-        keys = ["game_name", "streamer_count", "width", "height", "notify", "sound_file", "volume", "launch_at_startup"]
-        if key in keys:
-            return settings[keys.index(key)]
-        return default
+        return self.get(key, default)
+
+    def load_env(self):
+        """Read the .env file into memory the first time it is needed."""
+        if self.env is not None:
+            return self.env
+        self.env = {}
+        if self.env_file and os.path.exists(self.env_file):
+            with open(self.env_file, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("export "):
+                        line = line[len("export "):].lstrip()
+                    if "=" in line and not line.startswith("#"):
+                        key, value = line.split("=", 1)
+                        self.env[key.strip()] = self.unquote(value.strip())
+        return self.env
+
+    @staticmethod
+    def unquote(value):
+        """Strip one pair of matching quotes, as python-dotenv did."""
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            return value[1:-1]
+        return value
 
     def save_env_variable(self, key, value):
         """Save an environment variable to the .env file with the correct naming convention."""
@@ -48,6 +194,7 @@ class SettingsManager:
         }
         correct_key = key_mapping.get(key, key)
         os.environ[correct_key] = value
+        self.load_env()[correct_key] = value
 
         env_lines = []
         if os.path.exists(self.env_file):
@@ -55,25 +202,26 @@ class SettingsManager:
                 env_lines = f.readlines()
 
         updated = False
-        with open(self.env_file, "w") as f:
+        temp_path = f"{self.env_file}.tmp"
+        with open(temp_path, "w") as f:
             for line in env_lines:
-                if line.startswith(f"{correct_key}="):
+                assignment = line.strip()
+                if assignment.startswith("export "):
+                    assignment = assignment[len("export "):].lstrip()
+                if assignment.split("=", 1)[0].strip() == correct_key and "=" in assignment:
                     f.write(f"{correct_key}={value}\n")
                     updated = True
                 else:
                     f.write(line)
             if not updated:
                 f.write(f"{correct_key}={value}\n")
+        os.replace(temp_path, self.env_file)
 
     def load_env_variable(self, key):
-        """Load an environment variable from the .env file or the system."""
+        """Load an environment variable from the system or the .env file."""
         if key in os.environ:
             return os.environ[key]
-        if os.path.exists(self.env_file):
-            with open(self.env_file, "r") as f:
-                for line in f:
-                    if line.startswith(f"{key}="):
-                        return line.strip().split("=", 1)[1]
-                    if line.startswith(f"YOUR_{key}="):
-                        return line.strip().split("=", 1)[1]
-        return None
\ No newline at end of file
+        env = self.load_env()
+        if key in env:
+            return env[key]
+        return env.get(f"YOUR_{key}")
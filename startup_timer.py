@@ -0,0 +1,39 @@
+import threading
+import time
+
+
+class StartupTimer:
+    """Records how long each startup phase took and prints the breakdown once startup is done.
+
+    Does nothing unless enabled, so marks can stay in the startup path.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.phases = []
+        self.reported = False
+        self.lock = threading.Lock()
+
+    def mark(self, phase):
+        """Close the phase that ended just now; marks may come from any thread."""
+        if not self.enabled:
+            return
+        with self.lock:
+            now = time.perf_counter()
+            self.phases.append((phase, now - self.last, now - self.started, threading.current_thread().name))
+            self.last = now
+
+    def report(self):
+        """Print the phases once; later calls do nothing."""
+        with self.lock:
+            if not self.enabled or self.reported:
+                return
+            self.reported = True
+            phases = list(self.phases)
+
+        print("Startup timings:")
+        print(f"  {'phase':<28} {'ms':>8} {'total ms':>9}  thread")
+        for phase, duration, total, thread_name in phases:
+            print(f"  {phase:<28} {duration * 1000:>8.1f} {total * 1000:>9.1f}  {thread_name}")
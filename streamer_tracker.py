@@ -1,16 +1,102 @@
+import bisect
+import heapq
+import math
+import time
+
+
+class StreamerRecord:
+    """One tracked streamer; rank is its place in the latest top list, linger_started when it dropped out of it."""
+
+    __slots__ = ("id", "name", "link", "profile_picture", "rank", "linger_started")
+
+    def __init__(self, stream):
+        self.id = stream["id"]
+        self.rank = None
+        self.update(stream)
+
+    def update(self, stream):
+        self.name = stream["name"]
+        self.link = stream["link"]
+        self.profile_picture = stream.get("profile_picture")
+        self.linger_started = None
+
+    def as_dict(self, countdown=None):
+        data = {"id": self.id, "name": self.name, "link": self.link, "profile_picture": self.profile_picture}
+        if countdown is not None:
+            data["countdown"] = countdown
+        return data
+
+
+class TrackerDelta:
+    """What changed in one tick, so the UI only touches rows that need it.
+
+    added:     [(rank, record)] streamers new to the list
+    moved:     [(record, old_rank, new_rank)] streamers whose order relative to
+               the others changed; old_rank is None for one back from lingering
+    lingering: [(record, countdown)] linger progress in whole seconds left;
+               countdown == linger_duration means it just started lingering
+    removed:   [record] streamers whose row should go away
+    unchanged: number of streamers that kept their place
+    current:   records of the current top list in rank order
+    """
+
+    __slots__ = ("added", "moved", "lingering", "removed", "unchanged", "current", "linger_duration")
+
+    def __init__(self, linger_duration):
+        self.added = []
+        self.moved = []
+        self.lingering = []
+        self.removed = []
+        self.unchanged = 0
+        self.current = []
+        self.linger_duration = linger_duration
+
+    def is_empty(self):
+        return not (self.added or self.moved or self.lingering or self.removed)
+
+    def extend(self, other):
+        """Append another category's delta, shifting its ranks below ours."""
+        offset = len(self.current)
+        self.added.extend((rank + offset, record) for rank, record in other.added)
+        self.moved.extend(
+            (record, None if old_rank is None else old_rank + offset, new_rank + offset)
+            for record, old_rank, new_rank in other.moved
+        )
+        self.lingering.extend(other.lingering)
+        self.removed.extend(other.removed)
+        self.unchanged += other.unchanged
+        self.current.extend(other.current)
+
+
 class StreamerTracker:
-    linger_duration = 10
+    # Seconds a dropped streamer stays listed, whatever the poll interval.
+    linger_duration = 100
 
     def __init__(self, twitch_api, notify_var, notification_manager):
         self.twitch_api = twitch_api
         self.notify_var = notify_var
         self.notification_manager = notification_manager
-        self.seen_streamers = []
-        self.linger_streamers = []
+        self.now = 0.0
+        self.current = {}
+        self.lingering = {}
+        self.expiry = []
+
     def get_top_streams(self, game_id, streamer_count):
-        top_streams = self.twitch_api.get_top_streams(game_id, streamer_count)
-        streamer_ids = [stream["id"] for stream in top_streams]
-        profile_pictures = self.twitch_api.get_profile_pictures(streamer_ids)
+        # Each page's profile pictures are looked up on the pool while the
+        # next page is still being fetched. A page holds at most 100 ids, so a
+        # lookup is one batch and never waits on the pool itself.
+        executor = self.twitch_api.get_executor()
+        lookups = []
+        for page in self.twitch_api.iter_top_streams(game_id, streamer_count):
+            lookups.append((page, executor.submit(self.twitch_api.get_profile_pictures, [stream["id"] for stream in page])))
+
+        top_streams = []
+        for page, lookup in lookups:
+            top_streams.extend(self.with_profile_pictures(page, lookup.result()))
+        return top_streams
+
+    @staticmethod
+    def with_profile_pictures(streams, profile_pictures):
         return [
             {
                 "id": stream["id"],
@@ -18,37 +104,208 @@ class StreamerTracker:
                 "link": stream["link"],
                 "profile_picture": profile_pictures.get(stream["id"], None),
             }
-            for stream in top_streams
+            for stream in streams
         ]
 
-    def process_streamers(self, top_streams):
-        current_streamer_ids = {stream["id"] for stream in top_streams}
-        dropped_streamer_ids = {s["id"] for s in self.seen_streamers} - current_streamer_ids
+    def process_streamers(self, top_streams, now=None):
+        """Take the latest top list and return a TrackerDelta against the previous one.
 
-        self.update_linger_streamers(dropped_streamer_ids, current_streamer_ids)
-        self.seen_streamers = top_streams + [
-            s for s in self.linger_streamers if s["countdown"] > 0
-        ]
-        return top_streams
+        Linger countdowns run on now (time.monotonic() by default), so a
+        dropped streamer lingers linger_duration seconds even when adaptive
+        polling stretches the interval.
+        """
+        self.now = time.monotonic() if now is None else now
+        delta = TrackerDelta(self.linger_duration)
+        previous = self.current
+        current = {}
+        survivors = []
+        survivor_ranks = []
+        for stream in top_streams:
+            streamer_id = stream["id"]
+            # Helix pagination can repeat a streamer when viewer counts shift
+            # between pages; the first (higher) position wins.
+            if streamer_id in current:
+                continue
+            rank = len(current)
+            record = previous.get(streamer_id)
+            if record is not None:
+                survivors.append(record)
+                survivor_ranks.append(record.rank)
+                record.name = stream["name"]
+                record.link = stream["link"]
+                record.profile_picture = stream.get("profile_picture")
+            else:
+                record = self.lingering.get(streamer_id)
+                if record is None:
+                    record = StreamerRecord(stream)
+                    delta.added.append((rank, record))
+                else:
+                    # Still lingering, so its row is on screen and only has to move.
+                    delta.moved.append((record, None, rank))
+                    record.update(stream)
+            record.rank = rank
+            current[streamer_id] = record
 
+        moved = self.find_moved(survivors, survivor_ranks)
+        if moved:
+            delta.moved.extend(moved)
+            delta.moved.sort(key=lambda move: move[2])
+        delta.unchanged = len(survivors) - len(moved)
 
-    def update_linger_streamers(self, dropped_streamers, current_streamers):
-        self.linger_streamers = [
-            lingering for lingering in self.linger_streamers
-            if lingering["id"] not in current_streamers and lingering["countdown"] > 0
+        # Ids in current are unique, so as many survivors as previous streamers means nobody dropped.
+        if len(survivors) < len(previous):
+            dropped = [streamer_id for streamer_id in previous if streamer_id not in current]
+        else:
+            dropped = []
+        self.update_linger_streamers(dropped, current)
+        self.current = current
+
+        delta.current = list(current.values())
+        delta.removed = self.expire_linger_streamers()
+        delta.lingering = [(record, self.countdown(record)) for record in self.lingering.values()]
+        return delta
+
+    @staticmethod
+    def find_moved(survivors, old_ranks):
+        """Return (record, old_rank, new_rank) for survivors outside the longest run still in their old relative order.
+
+        Ranks shifting because something was inserted or dropped above a row
+        don't count as a move; only rows that must be repositioned do.
+        """
+        if all(a < b for a, b in zip(old_ranks, old_ranks[1:])):
+            return []
+
+        # Longest increasing subsequence of old ranks, O(n log n).
+        tails, tail_indexes, parents = [], [], [None] * len(old_ranks)
+        for index, old_rank in enumerate(old_ranks):
+            position = bisect.bisect_left(tails, old_rank)
+            if position:
+                parents[index] = tail_indexes[position - 1]
+            if position == len(tails):
+                tails.append(old_rank)
+                tail_indexes.append(index)
+            else:
+                tails[position] = old_rank
+                tail_indexes[position] = index
+
+        in_order = set()
+        index = tail_indexes[-1]
+        while index is not None:
+            in_order.add(index)
+            index = parents[index]
+
+        return [
+            (record, old_ranks[index], record.rank)
+            for index, record in enumerate(survivors)
+            if index not in in_order
         ]
 
-        for lingering in self.linger_streamers:
-            lingering["countdown"] -= 1
+    def update_linger_streamers(self, dropped_streamers, current_streamers):
+        # Lingering streamers that came back are live again.
+        for streamer_id in current_streamers.keys() & self.lingering.keys():
+            del self.lingering[streamer_id]
 
         for streamer_id in dropped_streamers:
-            if streamer_id not in current_streamers and not any(s["id"] == streamer_id for s in self.linger_streamers):
-                streamer_data = next((s for s in self.seen_streamers if s["id"] == streamer_id), None)
-                if streamer_data:
-                    self.linger_streamers.append({
-                        "id": streamer_data["id"],
-                        "name": streamer_data["name"],
-                        "link": streamer_data["link"],
-                        "profile_picture": streamer_data["profile_picture"],
-                        "countdown": self.linger_duration
-                    })
\ No newline at end of file
+            record = self.current[streamer_id]
+            record.linger_started = self.now
+            self.lingering[streamer_id] = record
+            heapq.heappush(self.expiry, (record.linger_started + self.linger_duration, streamer_id))
+
+    def expire_linger_streamers(self):
+        """Forget lingering streamers whose countdown ran out and return them.
+
+        Heap entries whose record was revived or re-dropped since are stale and just skipped.
+        """
+        expired = []
+        while self.expiry and self.expiry[0][0] <= self.now:
+            expires_at, streamer_id = heapq.heappop(self.expiry)
+            record = self.lingering.get(streamer_id)
+            if record is not None and record.linger_started + self.linger_duration == expires_at:
+                del self.lingering[streamer_id]
+                expired.append(record)
+        return expired
+
+    def countdown(self, record):
+        """Whole seconds a lingering record has left."""
+        return math.ceil(self.linger_duration - (self.now - record.linger_started))
+
+    @property
+    def linger_streamers(self):
+        """Lingering streamers as dicts with their remaining countdown, oldest first."""
+        return [record.as_dict(self.countdown(record)) for record in self.lingering.values()]
+
+    @property
+    def seen_streamers(self):
+        """Current streamers followed by lingering ones that still have countdown left."""
+        return [record.as_dict() for record in self.current.values()] + [
+            lingering for lingering in self.linger_streamers if lingering["countdown"] > 0
+        ]
+
+
+class MultiCategoryTracker:
+    """Tracks several categories with one batched /streams query per poll and a StreamerTracker per category."""
+
+    def __init__(self, twitch_api, notify_var, notification_manager):
+        self.twitch_api = twitch_api
+        self.notify_var = notify_var
+        self.notification_manager = notification_manager
+        self.trackers = {}
+        self.pending_removed = []
+
+    def set_categories(self, game_ids):
+        """Track exactly these games, keeping top-N and linger state for games that stay tracked.
+
+        Rows of games no longer tracked are reported as removed in the next delta.
+        """
+        for game_id, tracker in self.trackers.items():
+            if game_id not in game_ids:
+                self.pending_removed.extend(tracker.current.values())
+                self.pending_removed.extend(tracker.lingering.values())
+        self.trackers = {
+            game_id: self.trackers.get(game_id) or StreamerTracker(self.twitch_api, self.notify_var, self.notification_manager)
+            for game_id in game_ids
+        }
+
+    def get_top_streams(self, streamer_count):
+        """Return {game_id: top streams with profile pictures} for every tracked game."""
+        if len(self.trackers) == 1:
+            game_id, tracker = next(iter(self.trackers.items()))
+            return {game_id: tracker.get_top_streams(game_id, streamer_count)}
+
+        streams_by_game = self.twitch_api.get_top_streams_by_game(list(self.trackers), streamer_count)
+        streamer_ids = [stream["id"] for streams in streams_by_game.values() for stream in streams]
+        profile_pictures = self.twitch_api.get_profile_pictures(streamer_ids)
+        return {
+            game_id: StreamerTracker.with_profile_pictures(streams, profile_pictures)
+            for game_id, streams in streams_by_game.items()
+        }
+
+    def process_streamers(self, top_streams_by_game, now=None):
+        """Run each category through its own tracker and return one TrackerDelta for all of them."""
+        now = time.monotonic() if now is None else now
+        delta = TrackerDelta(StreamerTracker.linger_duration)
+        delta.removed, self.pending_removed = self.pending_removed, []
+        for game_id, streams in top_streams_by_game.items():
+            delta.extend(self.trackers[game_id].process_streamers(streams, now))
+        self.drop_stale_linger(delta)
+        return delta
+
+    def drop_stale_linger(self, delta):
+        """Forget lingering entries of streamers who are live in another category now.
+
+        Rows are keyed by streamer id, so a streamer who switched games shares
+        one row between the category they left and the one they joined; left
+        alone, the old category would recolour and later remove the live row.
+        """
+        if len(self.trackers) < 2 and not delta.removed:
+            return
+        live = {record.id for record in delta.current}
+        for tracker in self.trackers.values():
+            for streamer_id in live & tracker.lingering.keys():
+                del tracker.lingering[streamer_id]
+        delta.lingering = [(record, countdown) for record, countdown in delta.lingering if record.id not in live]
+        delta.removed = [record for record in delta.removed if record.id not in live]
+
+    @property
+    def linger_streamers(self):
+        return [lingering for tracker in self.trackers.values() for lingering in tracker.linger_streamers]
@@ -0,0 +1,192 @@
+import json
+import mmap
+import os
+import threading
+import zlib
+from collections import OrderedDict
+
+THUMBNAIL_WIDTH = 30
+THUMBNAIL_HEIGHT = 30
+SLOT_SIZE = THUMBNAIL_WIDTH * THUMBNAIL_HEIGHT * 4
+
+
+class ThumbnailStore:
+    """On-disk LRU of 30x30 RGBA avatars keyed by URL, packed into one memory-mapped file.
+
+    The data file is a row of fixed 3600-byte slots; a JSON index maps each URL
+    to its slot and a CRC of the pixels, in least recently used order. A slot
+    whose pixels don't match the CRC (the index was older than the data file
+    after a crash) is treated as a miss.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, index_path=None, max_slots=5000, save_every=50):
+        self.path = path
+        self.index_path = index_path or f"{os.path.splitext(path)[0]}.json"
+        self.max_slots = max_slots
+        self.save_every = save_every
+        self.entries = OrderedDict()
+        self.free_slots = []
+        self.capacity = 0
+        self.file = None
+        self.map = None
+        self.lock = threading.Lock()
+        self.save_lock = threading.Lock()
+        self.unsaved = 0
+        self.load()
+
+    def get(self, url):
+        """Return the RGBA bytes stored for url, or None."""
+        with self.lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return None
+            slot, crc = entry
+            start = slot * SLOT_SIZE
+            pixels = self.map[start:start + SLOT_SIZE]
+            if zlib.crc32(pixels) != crc:
+                del self.entries[url]
+                self.free_slots.append(slot)
+                self.unsaved += 1
+                return None
+            self.entries.move_to_end(url)
+            return pixels
+
+    def put(self, url, pixels):
+        """Store 30x30 RGBA pixels for url, evicting the least recently used avatar when full."""
+        if len(pixels) != SLOT_SIZE:
+            raise ValueError(f"Expected {SLOT_SIZE} bytes of RGBA pixels, got {len(pixels)}")
+
+        with self.lock:
+            if self.file is None:
+                return
+            entry = self.entries.pop(url, None)
+            if entry:
+                slot = entry[0]
+            elif self.free_slots:
+                slot = self.free_slots.pop()
+            elif self.capacity < self.max_slots:
+                slot = self.capacity
+                self.grow(min(self.max_slots, max(64, self.capacity * 2)))
+            else:
+                _, (slot, _) = self.entries.popitem(last=False)
+
+            start = slot * SLOT_SIZE
+            self.map[start:start + SLOT_SIZE] = pixels
+            self.entries[url] = (slot, zlib.crc32(pixels))
+            self.unsaved += 1
+            save_now = self.unsaved >= self.save_every
+
+        if save_now:
+            self.save()
+
+    def __contains__(self, url):
+        with self.lock:
+            return url in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def grow(self, capacity):
+        """Extend the data file to capacity slots and remap it; call with the lock held."""
+        if self.map is not None:
+            self.map.close()
+        self.free_slots.extend(range(capacity - 1, self.capacity, -1))
+        self.capacity = capacity
+        self.file.truncate(capacity * SLOT_SIZE)
+        self.map = mmap.mmap(self.file.fileno(), capacity * SLOT_SIZE)
+
+    def compact(self):
+        """Move avatars out of the highest slots into free ones and shrink the file to fit."""
+        with self.lock:
+            if self.file is None:
+                return
+            count = len(self.entries)
+            holes = sorted(slot for slot in self.free_slots if slot < count)
+            for url, (slot, crc) in list(self.entries.items()):
+                if slot >= count:
+                    target = holes.pop()
+                    self.map[target * SLOT_SIZE:(target + 1) * SLOT_SIZE] = self.map[slot * SLOT_SIZE:(slot + 1) * SLOT_SIZE]
+                    self.entries[url] = (target, crc)
+
+            if self.map is not None:
+                self.map.flush()
+                self.map.close()
+                self.map = None
+            self.capacity = count
+            self.free_slots = []
+            self.file.truncate(count * SLOT_SIZE)
+            if count:
+                self.map = mmap.mmap(self.file.fileno(), count * SLOT_SIZE)
+            self.unsaved += 1
+        self.save()
+
+    def load(self):
+        try:
+            mode = "r+b" if os.path.exists(self.path) else "w+b"
+            self.file = open(self.path, mode)
+        except OSError as e:
+            print(f"Error opening thumbnail store '{self.path}': {e}")
+            return
+
+        self.capacity = os.fstat(self.file.fileno()).st_size // SLOT_SIZE
+        if self.capacity:
+            self.map = mmap.mmap(self.file.fileno(), self.capacity * SLOT_SIZE)
+
+        index = {}
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r") as f:
+                    index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error loading thumbnail index '{self.index_path}': {e}")
+
+        if index.get("version") == self.VERSION and index.get("slot_size") == SLOT_SIZE:
+            for url, slot, crc in index.get("entries", []):
+                if slot < self.capacity:
+                    self.entries[url] = (slot, crc)
+
+        used = {slot for slot, _ in self.entries.values()}
+        self.free_slots = [slot for slot in range(self.capacity - 1, -1, -1) if slot not in used]
+
+        # Trim old entries if max_slots shrank, then drop the holes they and past evictions left.
+        while len(self.entries) > self.max_slots:
+            _, (slot, _) = self.entries.popitem(last=False)
+            self.free_slots.append(slot)
+        if len(self.free_slots) > self.capacity // 2 or self.capacity > self.max_slots:
+            self.compact()
+
+    def save(self):
+        """Flush the pixels and write the index if anything changed since the last save."""
+        # save_lock keeps concurrent saves off the shared temp file and in snapshot order.
+        with self.save_lock:
+            with self.lock:
+                if self.file is None or not self.unsaved:
+                    return
+                if self.map is not None:
+                    self.map.flush()
+                index = {
+                    "version": self.VERSION,
+                    "slot_size": SLOT_SIZE,
+                    "entries": [[url, slot, crc] for url, (slot, crc) in self.entries.items()],
+                }
+                self.unsaved = 0
+
+            temp_path = f"{self.index_path}.tmp"
+            try:
+                with open(temp_path, "w") as f:
+                    json.dump(index, f)
+                os.replace(temp_path, self.index_path)
+            except OSError as e:
+                print(f"Error saving thumbnail index '{self.index_path}': {e}")
+
+    def close(self):
+        self.save()
+        with self.lock:
+            if self.map is not None:
+                self.map.close()
+                self.map = None
+            if self.file:
+                self.file.close()
+                self.file = None
@@ -1,6 +1,4 @@
 import threading
-from pystray import Icon, MenuItem as item, Menu  # Add this import
-from PIL import Image
 import time
 import os
 import sys
@@ -12,36 +10,58 @@ class TrayIconManager:
         self.tray_icon = None
         self.blinking = False
         self.blink_thread = None
+        # Mirrors the window's withdrawn state so other threads never have to ask Tk.
+        self.withdrawn = False
 
         if hasattr(sys, "_MEIPASS"):
             self.icon_path = os.path.join(sys._MEIPASS, "TwitchScout.ico")
         else:
             self.icon_path = os.path.join(os.getcwd(), "dist", "TwitchScout.ico")
 
-        self.default_icon = self.create_icon(self.icon_path)
-        self.blink_icon = self.create_blink_icon()
+        # Built on first use; most sessions never go to the tray.
+        self.icons = None
+
+    @property
+    def default_icon(self):
+        return self.load_icons()[0]
+
+    @property
+    def blink_icon(self):
+        return self.load_icons()[1]
+
+    def load_icons(self):
+        if self.icons is None:
+            default_icon = self.create_icon(self.icon_path)
+            self.icons = (default_icon, self.create_blink_icon(default_icon))
+        return self.icons
 
     def create_icon(self, path):
         """Load the tray icon from the .ico file."""
+        from PIL import Image
+
         try:
             return Image.open(path)
         except Exception as e:
             print(f"Error loading icon: {e}")
             return None
 
-    def create_blink_icon(self):
+    def create_blink_icon(self, default_icon):
         """Create a red-tinted version of the tray icon for blinking."""
+        from PIL import Image
+
         try:
-            icon = self.default_icon.convert("RGBA")
+            icon = default_icon.convert("RGBA")
             red_tint = Image.new("RGBA", icon.size, (255, 0, 0, 0))
             blended_icon = Image.blend(icon, red_tint, alpha=0.5)
             return blended_icon
         except Exception as e:
             print(f"Error creating blink icon: {e}")
-            return self.default_icon
+            return default_icon
 
     def minimize_to_tray(self):
         """Minimize the app to the system tray."""
+        from pystray import Icon, MenuItem as item, Menu
+
         if not self.tray_icon:
             if self.default_icon:
                 menu = Menu(
@@ -102,11 +122,13 @@ class TrayIconManager:
         sys.exit()
 
     def on_minimize(self):
+        self.withdrawn = True
         self.root.withdraw()
         self.minimize_to_tray()
 
     def on_show(self):
         """Restore the application window and reset the tray icon."""
+        self.withdrawn = False
         self.root.deiconify()
         self.stop_blinking_icon()
         if self.tray_icon:
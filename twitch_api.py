@@ -1,95 +1,365 @@
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from rate_limiter import RateLimiter
+import threading
 import time
 
+HELIX_URL = "https://api.twitch.tv/helix"
+AUTH_URL = "https://id.twitch.tv/oauth2/token"
+
+class StreamPager:
+    """Cursor, limit and dedupe state for walking the /streams pages of one game.
+
+    Holds no connection, so TwitchAPI and AsyncTwitchAPI drive the same paging:
+    send params(), pass the decoded response to feed(), stop once done.
+    """
+
+    def __init__(self, game_id, limit, page_size=100):
+        self.game_id = game_id
+        self.remaining = limit
+        self.page_size = page_size
+        self.cursor = None
+        # A streamer who moves up while the next page is fetched can be listed
+        # twice; only their first appearance is kept.
+        self.seen = set()
+        self.done = limit <= 0
+
+    def params(self):
+        params = {"game_id": self.game_id, "first": min(self.page_size, self.remaining)}
+        if self.cursor:
+            params["after"] = self.cursor
+        return params
+
+    def feed(self, data):
+        """Take one /streams response and return its new streams, parsed."""
+        streams = data.get("data", [])
+        page = []
+        for stream in streams:
+            if stream["user_id"] not in self.seen and len(page) < self.remaining:
+                self.seen.add(stream["user_id"])
+                page.append(TwitchAPI.parse_stream(stream))
+        self.remaining -= len(page)
+        self.cursor = data.get("pagination", {}).get("cursor")
+        self.done = not streams or not self.cursor or self.remaining <= 0
+        return page
+
 class TwitchAPI:
-    def __init__(self, client_id, access_token):
+    negative_game_ttl = 10 * 60
+    request_timeout = 10
+
+    def __init__(self, client_id, access_token, pool_size=10, rate_limiter=None, max_retries=5, lookup_workers=4, game_cache=None, profile_cache=None, client_secret=None, on_token_refresh=None, base_url=HELIX_URL, auth_url=None):
         self.client_id = client_id
+        self.base_url = base_url.rstrip("/")
+        # A non-Twitch base URL (e.g. helix_stub) serves the token endpoint too.
+        self.auth_url = auth_url or (AUTH_URL if base_url == HELIX_URL else f"{self.base_url}/oauth2/token")
+        self.client_secret = client_secret
+        self.on_token_refresh = on_token_refresh
+        self.token_lock = threading.Lock()
+        self.game_cache = game_cache
+        self.profile_cache = profile_cache
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.lookup_workers = min(lookup_workers, pool_size)
+        self.executor = None
+        self.executor_lock = threading.Lock()
+        self.session = requests.Session()
+
+        # One keep-alive pool shared by every Helix call and image download,
+        # so a poll reuses open connections instead of paying for a new handshake.
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self.headers = {}
         self.access_token = access_token
 
+    @property
+    def access_token(self):
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value):
+        """Update the token and the auth headers shared by every Helix call."""
+        self._access_token = value
+        self.headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {value}"}
+
+    def helix_get(self, url, params=None):
+        """GET a Helix endpoint through the shared rate limiter, retrying throttled requests.
+
+        A 401 renews the app token once and replays the request.
+        """
+        refreshed = False
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            token = self.access_token
+            response = self.session.get(url, headers=self.headers, params=params, timeout=self.request_timeout)
+            if response.status_code == 401 and not refreshed:
+                refreshed = True
+                if self.refresh_access_token(token):
+                    continue
+                return response
+            if not self.rate_limiter.after_response(response.status_code, response.headers, attempt < self.max_retries):
+                return response
+        return response
+
+    def refresh_access_token(self, stale_token):
+        """Renew the app token after a 401; concurrent callers wait on a single refresh.
+
+        Returns True when a newer token is available to replay the request with.
+        """
+        with self.token_lock:
+            if self.access_token != stale_token:
+                # Another caller already renewed it while we waited.
+                return True
+            if not self.client_secret:
+                return False
+
+            access_token = self.generate_access_token(self.client_secret)
+            if not access_token:
+                return False
+            self.access_token = access_token
+
+        if self.on_token_refresh:
+            self.on_token_refresh(access_token)
+        return True
+
     def get_game_id(self, game_name):
-        url = "https://api.twitch.tv/helix/games"
-        headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(url, headers=headers, params={"name": game_name})
+        key = game_name.strip().lower()
+        if self.game_cache is not None:
+            cached = self.game_cache.get(key, self.game_cache.MISSING)
+            if cached is not self.game_cache.MISSING:
+                return cached
+
+        url = f"{self.base_url}/games"
+        response = self.helix_get(url, params={"name": game_name})
         data = response.json()
-        return data["data"][0]["id"] if data.get("data") else None
+        game_id = data["data"][0]["id"] if data.get("data") else None
+
+        if self.game_cache is not None and response.status_code == 200:
+            # Unknown names are remembered briefly so a typo doesn't cost a request every poll.
+            self.game_cache.set(key, game_id, ttl=None if game_id else self.negative_game_ttl)
+            self.game_cache.save()
+        return game_id
 
     def get_top_streams(self, game_id, limit):
-        url = "https://api.twitch.tv/helix/streams"
-        headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {self.access_token}"}
-        response = requests.get(url, headers=headers, params={"game_id": game_id, "first": limit})
-        data = response.json()
-        
-        return [
-            {
-                "id": stream["user_id"],
-                "name": stream["user_name"],
-                "link": f"https://twitch.tv/{stream.get('user_login', stream['user_name'])}"
-            }
-            for stream in data.get("data", [])
-        ]
+        return [stream for page in self.iter_top_streams(game_id, limit) for stream in page]
+
+    def iter_top_streams(self, game_id, limit, page_size=100):
+        """Yield pages of the top streams for a game, following the Helix cursor until limit is reached."""
+        url = f"{self.base_url}/streams"
+        pager = StreamPager(game_id, limit, page_size)
+        while not pager.done:
+            page = pager.feed(self.helix_get(url, params=pager.params()).json())
+            if page:
+                yield page
+
+    def get_top_streams_by_game(self, game_ids, limit, page_size=100, max_pages=None):
+        """Fetch the top streams of several games with one batched /streams query and split them per game.
+
+        Helix sorts the combined result by viewers, so pages are followed until
+        every game has limit streams or the cursor runs out. Games still short
+        after max_pages (a tiny category next to a huge one) are topped up with
+        their own query.
+        """
+        game_ids = list(game_ids)
+        if len(game_ids) == 1:
+            return {game_ids[0]: self.get_top_streams(game_ids[0], limit)}
+
+        url = f"{self.base_url}/streams"
+        streams_by_game = {game_id: [] for game_id in game_ids}
+        open_games = set(game_ids)
+        if max_pages is None:
+            max_pages = -(-limit * len(game_ids) // page_size) + 1
+        cursor = None
+        exhausted = False
+        seen = set()
+
+        for _ in range(max_pages):
+            params = [("game_id", game_id) for game_id in game_ids] + [("first", page_size)]
+            if cursor:
+                params.append(("after", cursor))
+            data = self.helix_get(url, params=params).json()
+
+            for stream in data.get("data", []):
+                game_id = stream.get("game_id")
+                if game_id in open_games and stream["user_id"] not in seen:
+                    seen.add(stream["user_id"])
+                    streams_by_game[game_id].append(self.parse_stream(stream))
+                    if len(streams_by_game[game_id]) >= limit:
+                        open_games.discard(game_id)
+
+            cursor = data.get("pagination", {}).get("cursor")
+            if not data.get("data") or not cursor:
+                exhausted = True
+            if exhausted or not open_games:
+                break
+
+        if not exhausted:
+            for game_id in open_games:
+                streams_by_game[game_id] = self.get_top_streams(game_id, limit)
+        return streams_by_game
+
+    @staticmethod
+    def parse_stream(stream):
+        return {
+            "id": stream["user_id"],
+            "name": stream["user_name"],
+            "link": f"https://twitch.tv/{stream.get('user_login', stream['user_name'])}"
+        }
 
     def generate_access_token(self, client_secret):
         """Generate an access token using the client ID and client secret."""
-        url = "https://id.twitch.tv/oauth2/token"
+        url = self.auth_url
         payload = {
             "client_id": self.client_id,
             "client_secret": client_secret,
             "grant_type": "client_credentials"
         }
-        response = requests.post(url, data=payload)
+        try:
+            # Runs under token_lock during a refresh, so it must not hang every Helix caller.
+            response = self.session.post(url, data=payload, timeout=self.request_timeout)
+        except requests.RequestException as e:
+            print(f"Failed to generate access token: {e}")
+            return None
         if response.status_code == 200:
             return response.json().get("access_token")
         else:
             print(f"Failed to generate access token: {response.status_code} - {response.text}")
             return None
     
+    def map_batches(self, fetch_batch, items, batch_size=100, latencies=None):
+        """Run fetch_batch over 100-item batches on the lookup pool and return the results in batch order.
+
+        Each batch still goes through helix_get, so the pool never outruns the
+        shared rate budget. Pass a list as latencies to get each batch's
+        duration appended to it; callers on other threads keep their own.
+        """
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+        def timed(batch):
+            started = time.perf_counter()
+            result = fetch_batch(batch)
+            return result, time.perf_counter() - started
+
+        if len(batches) > 1 and self.lookup_workers > 1:
+            timed_results = list(self.get_executor().map(timed, batches))
+        else:
+            timed_results = [timed(batch) for batch in batches]
+
+        if latencies is not None:
+            latencies.extend(latency for _, latency in timed_results)
+        return [result for result, _ in timed_results]
+
+    def get_executor(self):
+        """Return the lookup pool, creating it on first use."""
+        with self.executor_lock:
+            if not self.executor:
+                self.executor = ThreadPoolExecutor(max_workers=self.lookup_workers, thread_name_prefix="helix-lookup")
+            return self.executor
+
     def get_profile_pictures(self, user_ids, output_file="profile_pictures.txt"):
         """Fetch profile pictures for a list of Twitch user IDs and save them to a text file."""
-        url = "https://api.twitch.tv/helix/users"
-        headers = {"Client-ID": self.client_id, "Authorization": f"Bearer {self.access_token}"}
         profile_pictures = {}
-        batch_size = 100
+        unseen_ids = list(user_ids)
+        if self.profile_cache is not None:
+            unseen_ids = []
+            for user_id in user_ids:
+                cached = self.profile_cache.get(user_id, self.profile_cache.MISSING)
+                if cached is self.profile_cache.MISSING:
+                    unseen_ids.append(user_id)
+                else:
+                    profile_pictures[user_id] = cached
 
-        for i in range(0, len(user_ids), batch_size):
-            batch = user_ids[i:i + batch_size]
-            params = [("id", user_id) for user_id in batch]
+        # Only ids the cache has not seen cost a /helix/users lookup.
+        for fetched_users in self.map_batches(self.fetch_profile_batch, unseen_ids):
+            profile_pictures.update(fetched_users)
+            if self.profile_cache is not None:
+                for user_id, profile_picture in fetched_users.items():
+                    self.profile_cache.set(user_id, profile_picture)
 
-            try:
-                response = requests.get(url, headers=headers, params=params)
-                if response.status_code == 429:
-                    time.sleep(1)
-                    continue
-                if response.status_code != 200:
-                    print(f"Error fetching profile pictures: {response.status_code} - {response.text}")
-                    continue
+        if self.profile_cache is not None:
+            self.profile_cache.save()
+        return profile_pictures
 
-                data = response.json()
-                fetched_users = {user["id"]: user["profile_image_url"] for user in data.get("data", [])}
-                profile_pictures.update(fetched_users)
+    def fetch_profile_batch(self, batch):
+        """Fetch profile pictures for up to 100 user IDs in one /helix/users request."""
+        url = f"{self.base_url}/users"
+        params = [("id", user_id) for user_id in batch]
 
-            except requests.RequestException as e:
-                print(f"Request failed: {e}")
-                time.sleep(1)
-            time.sleep(0.5)
+        try:
+            response = self.helix_get(url, params=params)
+            if response.status_code != 200:
+                print(f"Error fetching profile pictures: {response.status_code} - {response.text}")
+                return {}
 
-        return profile_pictures
+            data = response.json()
+            return {user["id"]: user["profile_image_url"] for user in data.get("data", [])}
+
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return {}
+
+    def get_live_streams(self, user_ids):
+        """Check which users are live with 100-id /helix/streams batches.
+
+        Returns ({user_id: stream} for live users, set of ids whose batch failed)
+        so callers don't mistake a failed request for everyone going offline.
+        """
+        user_ids = list(user_ids)
+        live_streams = {}
+        unknown_ids = set()
+        for batch, fetched in zip(
+            [user_ids[i:i + 100] for i in range(0, len(user_ids), 100)],
+            self.map_batches(self.fetch_live_batch, user_ids),
+        ):
+            if fetched is None:
+                unknown_ids.update(batch)
+            else:
+                live_streams.update(fetched)
+        return live_streams, unknown_ids
+
+    def fetch_live_batch(self, batch):
+        """Fetch the live streams of up to 100 user IDs, or None if the request failed."""
+        url = f"{self.base_url}/streams"
+        params = [("user_id", user_id) for user_id in batch] + [("first", 100)]
+
+        try:
+            response = self.helix_get(url, params=params)
+            if response.status_code != 200:
+                print(f"Error fetching live streams: {response.status_code} - {response.text}")
+                return None
+            return {stream["user_id"]: self.parse_stream(stream) for stream in response.json().get("data", [])}
+
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            return None
 
     def search_categories(self, query):
-        """Search for categories on Twitch based on the query."""
-        url = "https://api.twitch.tv/helix/search/categories"
-        headers = {
-            "Client-ID": self.client_id,
-            "Authorization": f"Bearer {self.access_token}"
-        }
+        """Search for categories on Twitch based on the query; None when the request failed."""
+        url = f"{self.base_url}/search/categories"
         params = {"query": query, "first": 10}
-        response = requests.get(url, headers=headers, params=params)
+        response = self.helix_get(url, params=params)
 
         if response.status_code == 200:
             data = response.json()
-            return [{"id": item["id"], "name": item["name"]} for item in data.get("data", [])]
+            categories = [{"id": item["id"], "name": item["name"]} for item in data.get("data", [])]
+            self.remember_game_ids(categories)
+            return categories
         else:
-            return []
-
-
+            print(f"Error searching categories: {response.status_code}")
+            return None
 
+    def remember_game_ids(self, categories):
+        """Feed name -> id pairs we already have (e.g. from a category search) into the game cache."""
+        if self.game_cache is None or not categories:
+            return
+        for category in categories:
+            self.game_cache.set(category["name"].strip().lower(), category["id"])
+        self.game_cache.save()
 
+    def fetch_image(self, image_url, timeout=5):
+        """Download an image through the shared connection pool and return its bytes."""
+        response = self.session.get(image_url, timeout=timeout)
+        response.raise_for_status()
+        return response.content
@@ -0,0 +1,63 @@
+import itertools
+import threading
+
+
+class UIQueue:
+    """Thread-safe queue of UI commands that the Tk thread runs in batches at a bounded rate.
+
+    Background threads push() callables instead of calling root.after
+    themselves. A command pushed with a key replaces any pending command with
+    the same key, so only the latest timer text or row update is applied.
+    """
+
+    def __init__(self, root, max_fps=30, batch_size=500):
+        self.root = root
+        self.interval_ms = max(1, int(1000 / max_fps))
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.commands = {}
+        self.unkeyed = itertools.count()
+        self.running = False
+
+    def push(self, command, key=None):
+        """Queue command for the Tk thread; a pending command with the same key is dropped."""
+        with self.lock:
+            if key is None:
+                key = ("unkeyed", next(self.unkeyed))
+            else:
+                # Re-insert so a superseding command runs after anything queued before it.
+                self.commands.pop(key, None)
+            self.commands[key] = command
+
+    def __len__(self):
+        with self.lock:
+            return len(self.commands)
+
+    def start(self):
+        """Start draining on the Tk thread; call from the Tk thread."""
+        if not self.running:
+            self.running = True
+            self.root.after(self.interval_ms, self.drain)
+
+    def stop(self):
+        self.running = False
+
+    def drain(self):
+        """Run up to batch_size pending commands, then schedule the next frame."""
+        if not self.running:
+            return
+
+        with self.lock:
+            if len(self.commands) <= self.batch_size:
+                batch, self.commands = list(self.commands.values()), {}
+            else:
+                keys = list(itertools.islice(self.commands, self.batch_size))
+                batch = [self.commands.pop(key) for key in keys]
+
+        for command in batch:
+            try:
+                command()
+            except Exception as e:
+                print(f"Error updating UI: {e}")
+
+        self.root.after(self.interval_ms, self.drain)
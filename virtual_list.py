@@ -0,0 +1,133 @@
+import tkinter as tk
+from tkinter import ttk
+import webbrowser
+
+
+class VirtualList:
+    """Scrollable list of streamer rows that only keeps widgets for the rows in view.
+
+    Items are dicts with "id", "name", "link" and "profile_picture". Row widgets
+    are recycled while scrolling, so the widget count stays at one screenful
+    however many items the list holds. Avatars come from a shared ImageService;
+    a row gives its image reference back when it is recycled.
+    """
+
+    def __init__(self, parent_frame, image_service, row_height=34, bg_color="#2e2e2e",
+                 scrollbar_style="#815ac0.Vertical.TScrollbar"):
+        self.image_service = image_service
+        self.row_height = row_height
+        self.bg_color = bg_color
+        self.items = []
+        self.keys = set()
+        self.rows = []
+
+        container = tk.Frame(parent_frame, bg="#815ac0", highlightthickness=1, highlightbackground="#815ac0")
+        container.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        self.canvas = tk.Canvas(container, bg=bg_color, highlightthickness=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        scrollbar = ttk.Scrollbar(container, orient="vertical", command=self.yview, style=scrollbar_style)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+
+        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.canvas.bind("<Enter>", lambda e: self.canvas.bind_all("<MouseWheel>", self.on_mousewheel))
+        self.canvas.bind("<Leave>", lambda e: self.canvas.unbind_all("<MouseWheel>"))
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.items)
+
+    def append(self, item):
+        """Add an item at the bottom; items whose id is already listed are ignored."""
+        if item["id"] in self.keys:
+            return False
+        self.keys.add(item["id"])
+        self.items.append(item)
+        self.update_scrollregion()
+        self.refresh()
+        return True
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.refresh()
+
+    def on_mousewheel(self, event):
+        self.canvas.yview_scroll(-1 * (event.delta // 120), "units")
+        self.refresh()
+
+    def on_canvas_configure(self, event):
+        for row in self.rows:
+            self.canvas.itemconfigure(row.window, width=event.width)
+        self.refresh()
+
+    def update_scrollregion(self):
+        height = len(self.items) * self.row_height
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height),
+                              yscrollincrement=self.row_height)
+
+    def refresh(self):
+        """Show the rows that intersect the viewport, reusing row widgets for new items."""
+        first = max(0, int(self.canvas.canvasy(0) // self.row_height))
+        visible = self.canvas.winfo_height() // self.row_height + 2
+        last = min(len(self.items), first + visible)
+
+        while len(self.rows) < last - first:
+            self.rows.append(self.create_row())
+
+        for offset, row in enumerate(self.rows):
+            index = first + offset
+            if index >= last:
+                self.canvas.itemconfigure(row.window, state="hidden")
+                continue
+            self.canvas.coords(row.window, 0, index * self.row_height)
+            self.canvas.itemconfigure(row.window, state="normal")
+            if row.item is not self.items[index]:
+                self.show_item(row, self.items[index])
+
+    def create_row(self):
+        row = tk.Frame(self.canvas, bg=self.bg_color)
+        row.item = None
+        row.image_url = None
+        row.image_label = tk.Label(row, bg=self.bg_color, cursor="hand2")
+        row.text_label = tk.Label(row, bg=self.bg_color, fg="#ffffff", anchor="w")
+        row.text_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        for widget in (row.image_label, row.text_label):
+            widget.bind("<Button-1>", lambda e, row=row: self.open_link(row))
+        row.window = self.canvas.create_window(
+            0, 0, window=row, anchor="nw", width=self.canvas.winfo_width(), height=self.row_height
+        )
+        return row
+
+    def show_item(self, row, item):
+        if row.image_url:
+            self.image_service.release(row.image_url)
+            row.image_url = None
+        row.item = item
+        row.text_label.configure(text=item["name"], cursor="hand2" if item.get("link") else "arrow")
+
+        image_url = item.get("profile_picture")
+        if not image_url:
+            row.image_label.pack_forget()
+            return
+
+        row.image_label.pack(side=tk.LEFT, before=row.text_label)
+
+        def on_ready(photo_image):
+            # The row may have been recycled for another item while the image loaded.
+            if row.item is not item:
+                self.image_service.release(image_url)
+                return
+            row.image_label.configure(image=photo_image)
+            row.image_label.image = photo_image
+            row.image_url = image_url
+
+        row.image_label.configure(image=self.image_service.get(image_url, on_ready))
+
+    @staticmethod
+    def open_link(row):
+        if row.item and row.item.get("link"):
+            webbrowser.open(row.item["link"])